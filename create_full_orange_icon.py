@@ -2,68 +2,60 @@
 """
 Generate a PebbleNote icon with full orange background, "P" letter and "PebbleNote" text
 """
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import os
 
+from pebble_assets import profiling
+from pebble_assets.encoder import save_png
+from pebble_assets.fonts import get_font
+
 size = 1024
 orange = (255, 149, 0)
 white = (255, 255, 255)
 
-# Create full orange background
-img = Image.new('RGBA', (size, size), orange)
-draw = ImageDraw.Draw(img)
-
-# Find a suitable font
-font_path = None
-for fp in [
-    "C:/Windows/Fonts/segoeuib.ttf",  # Segoe UI Bold
-    "C:/Windows/Fonts/arialbd.ttf",   # Arial Bold
-    "C:/Windows/Fonts/segoeui.ttf",
-    "C:/Windows/Fonts/arial.ttf",
-    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-]:
-    if os.path.exists(fp):
-        font_path = fp
-        break
+def main():
+    """Draw the full orange icon and save it to assets/icon/icon.png"""
+    # Create full orange background
+    img = Image.new('RGBA', (size, size), orange)
+    draw = ImageDraw.Draw(img)
 
-# Draw the "P" (centered, large)
-try:
-    if font_path:
-        font_large = ImageFont.truetype(font_path, 480)
-    else:
-        font_large = ImageFont.load_default()
+    # Draw the "P" (centered, large)
+    try:
+        font_large = get_font("sans-bold", 480)
     
-    text_p = "P"
-    # Use textbbox instead of textsize (Pillow 10+)
-    bbox = draw.textbbox((0, 0), text_p, font=font_large)
-    w = bbox[2] - bbox[0]
-    h = bbox[3] - bbox[1]
-    x = (size - w) // 2
-    y = (size - h) // 2 - 100  # Shift up to make room for text below
-    draw.text((x, y), text_p, font=font_large, fill=white)
-    print(f"✅ Drew 'P' at ({x}, {y})")
-except Exception as e:
-    print(f"Error drawing P: {e}")
+        text_p = "P"
+        # Use textbbox instead of textsize (Pillow 10+)
+        bbox = draw.textbbox((0, 0), text_p, font=font_large)
+        w = bbox[2] - bbox[0]
+        h = bbox[3] - bbox[1]
+        x = (size - w) // 2
+        y = (size - h) // 2 - 100  # Shift up to make room for text below
+        draw.text((x, y), text_p, font=font_large, fill=white)
+        print(f"✅ Drew 'P' at ({x}, {y})")
+    except Exception as e:
+        print(f"Error drawing P: {e}")
 
-# Draw "PebbleNote" below the P
-try:
-    if font_path:
-        font_small = ImageFont.truetype(font_path, 100)
-    else:
-        font_small = ImageFont.load_default()
+    # Draw "PebbleNote" below the P
+    try:
+        font_small = get_font("sans-bold", 100)
     
-    text_name = "PebbleNote"
-    bbox2 = draw.textbbox((0, 0), text_name, font=font_small)
-    w2 = bbox2[2] - bbox2[0]
-    h2 = bbox2[3] - bbox2[1]
-    x2 = (size - w2) // 2
-    y2 = size // 2 + 200  # Below the P
-    draw.text((x2, y2), text_name, font=font_small, fill=white)
-    print(f"✅ Drew 'PebbleNote' at ({x2}, {y2})")
-except Exception as e:
-    print(f"Error drawing PebbleNote: {e}")
+        text_name = "PebbleNote"
+        bbox2 = draw.textbbox((0, 0), text_name, font=font_small)
+        w2 = bbox2[2] - bbox2[0]
+        h2 = bbox2[3] - bbox2[1]
+        x2 = (size - w2) // 2
+        y2 = size // 2 + 200  # Below the P
+        draw.text((x2, y2), text_name, font=font_small, fill=white)
+        print(f"✅ Drew 'PebbleNote' at ({x2}, {y2})")
+    except Exception as e:
+        print(f"Error drawing PebbleNote: {e}")
+
+    # Save the icon
+    os.makedirs("assets/icon", exist_ok=True)
+    save_png(img, "assets/icon/icon.png")
+    print("✅ Generated icon with P and PebbleNote: assets/icon/icon.png")
+
 
-# Save the icon
-os.makedirs("assets/icon", exist_ok=True)
-img.save("assets/icon/icon.png")
-print("✅ Generated icon with P and PebbleNote: assets/icon/icon.png")
+if __name__ == '__main__':
+    with profiling.session("Create the full orange app icon"):
+        main()
@@ -5,13 +5,13 @@ Creates a 1024x1024 PNG icon with a clean notepad design
 and a prominent "P" initial.
 """
 
-try:
-    from PIL import Image, ImageDraw, ImageFont
-    import os
-except ImportError:
-    print("PIL (Pillow) not found. Installing...")
-    os.system("pip install Pillow")
-    from PIL import Image, ImageDraw, ImageFont
+import os
+
+from PIL import Image, ImageDraw
+
+from pebble_assets import profiling
+from pebble_assets.encoder import save_png
+from pebble_assets.fonts import get_font
     
 def create_pebblenote_icon():
     # Create a 1024x1024 image with transparent background
@@ -90,15 +90,8 @@ def create_pebblenote_icon():
     
     # Draw app initial "P"
     try:
-        # Try to use a system font
         font_size = 300
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            try:
-                font = ImageFont.truetype("C:\\Windows\\Fonts\\arial.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
+        font = get_font("sans", font_size)
         
         # Calculate text position to center it
         text = "P"
@@ -124,7 +117,7 @@ def create_pebblenote_icon():
     
     # Save the icon
     icon_path = os.path.join("assets", "icon", "app_icon.png")
-    image.save(icon_path, "PNG")
+    save_png(image, icon_path)
     print(f"Icon created successfully at: {icon_path}")
     
     # Also create a smaller version for favicon
@@ -133,10 +126,11 @@ def create_pebblenote_icon():
     
     # Check if web directory exists
     if os.path.exists("web"):
-        favicon.save(favicon_path, "PNG")
+        save_png(favicon, favicon_path)
         print(f"Favicon created successfully at: {favicon_path}")
     
     return icon_path
 
 if __name__ == "__main__":
-    create_pebblenote_icon()
\ No newline at end of file
+    with profiling.session("Create the 1024x1024 PebbleNote app icon and favicon"):
+        create_pebblenote_icon()
\ No newline at end of file
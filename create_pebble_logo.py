@@ -3,29 +3,24 @@
 Generate PebbleNote icon with full orange background (no white corners)
 Recreates the stylized P logo with PebbleNote text
 """
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageDraw, ImageFilter
 import os
 import math
 
+from pebble_assets import profiling
+from pebble_assets.encoder import save_png
+from pebble_assets.fonts import get_font
+from pebble_assets.gradients import diagonal_gradient
+
 def create_PebbleNote_icon():
     size = 1024
     orange = (255, 149, 0)  # Main orange
     dark_orange = (230, 120, 0)  # Darker orange for gradient effect
     white = (255, 255, 255)
     
-    # Create full orange background - NO transparency, NO rounded corners
-    img = Image.new('RGB', (size, size), orange)
-    draw = ImageDraw.Draw(img)
-    
-    # Add subtle gradient from top-left to bottom-right
-    for y in range(size):
-        for x in range(size):
-            # Calculate gradient factor
-            factor = (x + y) / (2 * size)
-            r = int(orange[0] - (orange[0] - dark_orange[0]) * factor * 0.3)
-            g = int(orange[1] - (orange[1] - dark_orange[1]) * factor * 0.3)
-            b = int(orange[2] - (orange[2] - dark_orange[2]) * factor * 0.3)
-            img.putpixel((x, y), (r, g, b))
+    # Full orange background - NO transparency, NO rounded corners -
+    # with a subtle gradient from top-left to bottom-right
+    img = diagonal_gradient((size, size), orange, dark_orange, strength=0.3)
     
     draw = ImageDraw.Draw(img)
     
@@ -97,21 +92,7 @@ def create_PebbleNote_icon():
     
     # Draw "PebbleNote" text
     try:
-        font_path = None
-        for fp in [
-            "C:/Windows/Fonts/segoeuib.ttf",
-            "C:/Windows/Fonts/arialbd.ttf", 
-            "C:/Windows/Fonts/segoeui.ttf",
-            "C:/Windows/Fonts/arial.ttf",
-        ]:
-            if os.path.exists(fp):
-                font_path = fp
-                break
-        
-        if font_path:
-            font = ImageFont.truetype(font_path, 85)
-        else:
-            font = ImageFont.load_default()
+        font = get_font("sans-bold", 85)
         
         text = "PebbleNote"
         bbox = draw.textbbox((0, 0), text, font=font)
@@ -127,10 +108,11 @@ def create_PebbleNote_icon():
     
     # Save
     os.makedirs("assets/icon", exist_ok=True)
-    img.save("assets/icon/icon.png", "PNG")
+    save_png(img, "assets/icon/icon.png")
     print(f"✅ Generated icon: assets/icon/icon.png ({size}x{size})")
     
     return img
 
 if __name__ == "__main__":
-    create_PebbleNote_icon()
+    with profiling.session("Create the PebbleNote logo icon"):
+        create_PebbleNote_icon()
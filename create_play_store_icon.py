@@ -6,6 +6,9 @@ Following specifications from: https://developer.android.com/distribute/google-p
 from PIL import Image, ImageDraw, ImageFont
 import os
 
+from pebble_assets import profiling
+from pebble_assets.encoder import save_png
+
 def create_play_store_icon():
     # Google Play icon specifications
     size = 512  # 512x512px required
@@ -68,7 +71,7 @@ def create_play_store_icon():
     
     # Save the icon
     output_path = 'assets/icon/icon_512.png'
-    img.save(output_path, 'PNG', optimize=True, quality=100)
+    save_png(img, output_path)
     print(f"✅ Created Google Play icon: {output_path}")
     print(f"   Size: {size}x{size}px")
     print(f"   Format: PNG (32-bit)")
@@ -76,7 +79,7 @@ def create_play_store_icon():
     
     # Also create the standard icon.png (same file, just copy)
     standard_path = 'assets/icon/icon.png'
-    img.save(standard_path, 'PNG', optimize=True, quality=100)
+    save_png(img, standard_path)
     print(f"✅ Created standard icon: {standard_path}")
     
     # Create adaptive icon foreground (transparent background with just the P)
@@ -104,13 +107,13 @@ def create_play_store_icon():
     ], fill=(0, 0, 0, 0))
     
     fg_path = 'assets/icon/icon_foreground.png'
-    fg_img.save(fg_path, 'PNG')
+    save_png(fg_img, fg_path)
     print(f"✅ Created adaptive foreground: {fg_path}")
     
     # Create splash screen version (no white background)
     splash_img = img.copy()
     splash_path = 'assets/icon/icon_splash.png'
-    splash_img.save(splash_path, 'PNG', optimize=True, quality=100)
+    save_png(splash_img, splash_path)
     print(f"✅ Created splash screen icon: {splash_path}")
     
     print("\n📋 Next steps:")
@@ -121,4 +124,5 @@ def create_play_store_icon():
 if __name__ == '__main__':
     # Ensure assets/icon directory exists
     os.makedirs('assets/icon', exist_ok=True)
-    create_play_store_icon()
+    with profiling.session("Create the Play Store icon and its variants"):
+        create_play_store_icon()
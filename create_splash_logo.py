@@ -6,9 +6,13 @@ Create the PebbleNote splash logo image with:
 - "Capture Your Thoughts" tagline
 """
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import os
 
+from pebble_assets import profiling
+from pebble_assets.encoder import save_png
+from pebble_assets.fonts import get_font
+
 def create_splash_logo():
     # Canvas size (will be scaled down for different densities)
     width, height = 768, 1366
@@ -41,40 +45,9 @@ def create_splash_logo():
     else:
         print(f"⚠️ P logo not found at {p_logo_path}")
     
-    # Try to load fonts
-    try:
-        # Try system fonts for "PebbleNote" title
-        title_font_paths = [
-            'C:/Windows/Fonts/arialbd.ttf',
-            'C:/Windows/Fonts/Arial Bold.ttf',
-            '/System/Library/Fonts/Helvetica.ttc',
-        ]
-        title_font = None
-        for path in title_font_paths:
-            if os.path.exists(path):
-                title_font = ImageFont.truetype(path, 72)
-                break
-        if not title_font:
-            title_font = ImageFont.load_default()
-        
-        # Try system fonts for tagline (italic)
-        tagline_font_paths = [
-            'C:/Windows/Fonts/ariali.ttf',
-            'C:/Windows/Fonts/Arial Italic.ttf',
-            '/System/Library/Fonts/Helvetica.ttc',
-        ]
-        tagline_font = None
-        for path in tagline_font_paths:
-            if os.path.exists(path):
-                tagline_font = ImageFont.truetype(path, 36)
-                break
-        if not tagline_font:
-            tagline_font = ImageFont.load_default()
-            
-    except Exception as e:
-        print(f"Font loading error: {e}")
-        title_font = ImageFont.load_default()
-        tagline_font = ImageFont.load_default()
+    # Bold title and italic tagline from the shared font registry
+    title_font = get_font('sans-bold', 72)
+    tagline_font = get_font('sans-italic', 36)
     
     # Draw "PebbleNote" title
     title_text = "PebbleNote"
@@ -99,11 +72,12 @@ def create_splash_logo():
     
     # Save the splash logo
     output_path = 'assets/icon/splash_logo.png'
-    img.save(output_path, 'PNG', optimize=True)
+    save_png(img, output_path)
     print(f"✅ Created splash logo: {output_path}")
     print(f"   Size: {width}x{height}")
     
     return output_path
 
 if __name__ == '__main__':
-    create_splash_logo()
+    with profiling.session("Create the splash logo"):
+        create_splash_logo()
@@ -2,58 +2,61 @@
 Generate splash screen design mockup for PebbleNote
 Shows the new layout with centered logo icon on white background
 """
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 import os
 
-# Create 1080x1920 splash screen mockup (9:16 ratio)
-width, height = 1080, 1920
+from pebble_assets import profiling
+from pebble_assets.encoder import save_png
+from pebble_assets.fonts import get_font
 
-# Create white background
-img = Image.new('RGB', (width, height), color='#FFFFFF')
-draw = ImageDraw.Draw(img)
+def main():
+    """Render the splash screen mockup to assets/icon/splash_screen_mockup.png"""
+    # Create 1080x1920 splash screen mockup (9:16 ratio)
+    width, height = 1080, 1920
 
-# Try to load the actual icon
-icon_path = 'assets/icon/icon.png'
-if os.path.exists(icon_path):
-    icon = Image.open(icon_path)
-    # Resize to 600x600 (300 * 2 for mockup scale) - NO BORDER
-    icon = icon.resize((600, 600), Image.Resampling.LANCZOS)
+    # Create white background
+    img = Image.new('RGB', (width, height), color='#FFFFFF')
+    draw = ImageDraw.Draw(img)
+
+    # Try to load the actual icon
+    icon_path = 'assets/icon/icon.png'
+    if os.path.exists(icon_path):
+        icon = Image.open(icon_path)
+        # Resize to 600x600 (300 * 2 for mockup scale) - NO BORDER
+        icon = icon.resize((600, 600), Image.Resampling.LANCZOS)
     
-    # Calculate position to center the icon
-    icon_x = (width - 600) // 2
-    icon_y = (height - 600) // 2 - 120  # Slightly above center
+        # Calculate position to center the icon
+        icon_x = (width - 600) // 2
+        icon_y = (height - 600) // 2 - 120  # Slightly above center
     
-    # Paste icon (with alpha if available) - no clipping/border
-    if icon.mode == 'RGBA':
-        img.paste(icon, (icon_x, icon_y), icon)
-    else:
-        img.paste(icon, (icon_x, icon_y))
-
-# Try to use elegant serif fonts - Playfair Display style (Georgia, Times New Roman as fallback)
-font_tagline = None
-for font_name in ['georgia.ttf', 'georgiaz.ttf', 'times.ttf', 'timesi.ttf', 'palatino.ttf', 'arial.ttf']:
-    try:
-        font_tagline = ImageFont.truetype(font_name, 56)  # Larger font size
-        break
-    except:
-        continue
-if font_tagline is None:
-    font_tagline = ImageFont.load_default()
-
-# Draw tagline in orange color - elegant serif style
-tagline = "Capture Your Thoughts"
-tagline_bbox = draw.textbbox((0, 0), tagline, font=font_tagline)
-tagline_width = tagline_bbox[2] - tagline_bbox[0]
-tagline_x = (width - tagline_width) // 2
-tagline_y = height // 2 + 260
-
-draw.text((tagline_x, tagline_y), tagline, fill='#FF9500', font=font_tagline)
-
-# Save mockup
-output_path = 'assets/icon/splash_screen_mockup.png'
-img.save(output_path, 'PNG')
-print(f"✅ Splash screen mockup saved to: {output_path}")
-print(f"   Size: {width}x{height}px")
-print(f"   Design: Centered PebbleNote icon (220x220)")
-print(f"   Background: White (#FFFFFF)")
-print(f"   Tagline: 'Capture Your Thoughts' (Orange)")
+        # Paste icon (with alpha if available) - no clipping/border
+        if icon.mode == 'RGBA':
+            img.paste(icon, (icon_x, icon_y), icon)
+        else:
+            img.paste(icon, (icon_x, icon_y))
+
+    # Elegant serif font (the bundled DejaVu Serif, so every machine renders it alike)
+    font_tagline = get_font('serif', 56)  # Larger font size
+
+    # Draw tagline in orange color - elegant serif style
+    tagline = "Capture Your Thoughts"
+    tagline_bbox = draw.textbbox((0, 0), tagline, font=font_tagline)
+    tagline_width = tagline_bbox[2] - tagline_bbox[0]
+    tagline_x = (width - tagline_width) // 2
+    tagline_y = height // 2 + 260
+
+    draw.text((tagline_x, tagline_y), tagline, fill='#FF9500', font=font_tagline)
+
+    # Save mockup
+    output_path = 'assets/icon/splash_screen_mockup.png'
+    save_png(img, output_path)
+    print(f"✅ Splash screen mockup saved to: {output_path}")
+    print(f"   Size: {width}x{height}px")
+    print(f"   Design: Centered PebbleNote icon (220x220)")
+    print(f"   Background: White (#FFFFFF)")
+    print(f"   Tagline: 'Capture Your Thoughts' (Orange)")
+
+
+if __name__ == '__main__':
+    with profiling.session("Create the splash screen mockup"):
+        main()
@@ -2,43 +2,31 @@
 """
 Fix icon by filling all transparent areas with orange background
 """
-from PIL import Image
 import os
 
-def fix_icon_transparency(img_path):
-    """Fill transparent areas with orange"""
-    img = Image.open(img_path).convert('RGBA')
-    
-    # Create orange background
-    orange_bg = Image.new('RGBA', img.size, (255, 149, 0, 255))
-    
-    # Composite: put original on top of orange background
-    result = Image.alpha_composite(orange_bg, img)
-    
-    # Convert to RGB (no transparency) and save
-    result = result.convert('RGB')
-    result.save(img_path)
-    print(f'Fixed: {img_path}')
+from pebble_assets import profiling
+from pebble_assets.pipeline import MIPMAP_FOLDERS, ORANGE, Pipeline, flatten
 
-# Fix source icon first
-source_icon = 'assets/icon/icon.png'
-if os.path.exists(source_icon):
-    fix_icon_transparency(source_icon)
-    print('Source icon fixed!')
+# Composite onto orange and drop the alpha channel
+FIX_TRANSPARENCY = Pipeline(flatten(ORANGE))
 
-# Fix all Android mipmap icons
-folders = [
-    'android/app/src/main/res/mipmap-mdpi',
-    'android/app/src/main/res/mipmap-hdpi',
-    'android/app/src/main/res/mipmap-xhdpi',
-    'android/app/src/main/res/mipmap-xxhdpi',
-    'android/app/src/main/res/mipmap-xxxhdpi',
-]
+def main():
+    """Flatten the source icon and every mipmap icon onto orange"""
+    # Fix source icon first
+    source_icon = 'assets/icon/icon.png'
+    if os.path.exists(source_icon):
+        if FIX_TRANSPARENCY.run(source_icon):
+            print(f'Fixed: {source_icon}')
+            print('Source icon fixed!')
+        else:
+            print(f'Already fixed: {source_icon}')
 
-for folder in folders:
-    if os.path.exists(folder):
-        for f in os.listdir(folder):
-            if f.endswith('.png'):
-                fix_icon_transparency(os.path.join(folder, f))
+    # Fix all Android mipmap icons
+    FIX_TRANSPARENCY.run_folders(MIPMAP_FOLDERS)
 
-print('All icons fixed!')
+    print('All icons fixed!')
+
+
+if __name__ == '__main__':
+    with profiling.session("Flatten the source and mipmap icons onto orange"):
+        main()
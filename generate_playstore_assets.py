@@ -6,19 +6,30 @@ Generate all Play Store assets for PebbleNote app
 - Feature graphic (1024x500)
 """
 
+import argparse
 import os
 import math
 
-try:
-    from PIL import Image, ImageDraw, ImageFont
-except ImportError:
-    print("Installing Pillow...")
-    os.system("pip install Pillow")
-    from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
 
+from pebble_assets import profiling, writer
+from pebble_assets.encoder import save_png
+from pebble_assets.fonts import get_font
+from pebble_assets.manifest import AssetManifest
+from pebble_assets.outputs import save_copies
+from pebble_assets.pyramid import ResizePyramid
+from pebble_assets.vector import Ellipse, Line, Polygon, RoundedRect, rasterize
 
-def draw_pebblenote_icon(draw, size, with_background=True):
-    """Draw the PebbleNote icon design matching the app's brand icon"""
+# Icons are drawn once at this supersampled size and every target is
+# downsampled from it, so small sizes come out anti-aliased
+MASTER_SIZE = 2048
+SUPERSAMPLE = True
+
+_master_pyramid = None
+
+
+def pebblenote_shapes(size, with_background=True):
+    """The PebbleNote icon design matching the app's brand icon, as shapes on a size x size canvas"""
     
     # Colors
     orange = (255, 149, 0)  # #FF9500
@@ -28,16 +39,13 @@ def draw_pebblenote_icon(draw, size, with_background=True):
     
     margin = size * 0.05
     corner_radius = size * 0.22
+    shapes = []
     
     if with_background:
-        # Draw orange rounded square background
-        draw.rounded_rectangle(
-            [margin, margin, size - margin, size - margin],
-            radius=corner_radius,
-            fill=orange
-        )
-    
-    # Draw horizontal lines
+        # Orange rounded square background
+        shapes.append(RoundedRect((margin, margin, size - margin, size - margin), corner_radius, orange))
+    
+    # Horizontal lines
     line_thickness = size * 0.028
     left_pad = size * 0.17
     right_pad = size * 0.17
@@ -46,13 +54,10 @@ def draw_pebblenote_icon(draw, size, with_background=True):
     
     for i in range(5):
         y = top_pad + (line_gap * i)
-        draw.rounded_rectangle(
-            [left_pad, y, size - right_pad, y + line_thickness],
-            radius=line_thickness / 2,
-            fill=line_color
-        )
+        shapes.append(RoundedRect((left_pad, y, size - right_pad, y + line_thickness),
+                                  line_thickness / 2, line_color))
     
-    # Draw pencil (white body with yellow tip)
+    # Pencil (white body with yellow tip)
     pencil_length = size * 0.55
     pencil_thickness = size * 0.10
     
@@ -71,27 +76,17 @@ def draw_pebblenote_icon(draw, size, with_background=True):
     end_x = center_x + dx
     end_y = center_y + dy
     
-    # Draw pencil body (thick white line with rounded caps)
-    draw.line(
-        [(start_x, start_y), (end_x, end_y)],
-        fill=white,
-        width=int(pencil_thickness)
-    )
+    # Pencil body (thick white line with rounded caps)
+    shapes.append(Line(((start_x, start_y), (end_x, end_y)), pencil_thickness, white))
     
-    # Draw rounded caps
+    # Rounded caps
     cap_radius = pencil_thickness / 2
-    draw.ellipse(
-        [start_x - cap_radius, start_y - cap_radius,
-         start_x + cap_radius, start_y + cap_radius],
-        fill=white
-    )
-    draw.ellipse(
-        [end_x - cap_radius, end_y - cap_radius,
-         end_x + cap_radius, end_y + cap_radius],
-        fill=white
-    )
+    shapes.append(Ellipse((start_x - cap_radius, start_y - cap_radius,
+                           start_x + cap_radius, start_y + cap_radius), white))
+    shapes.append(Ellipse((end_x - cap_radius, end_y - cap_radius,
+                           end_x + cap_radius, end_y + cap_radius), white))
     
-    # Draw yellow pencil tip (triangle)
+    # Yellow pencil tip (triangle)
     tip_size = pencil_thickness * 1.2
     tip_x = end_x + math.cos(angle) * (tip_size * 0.5)
     tip_y = end_y + math.sin(angle) * (tip_size * 0.5)
@@ -101,52 +96,119 @@ def draw_pebblenote_icon(draw, size, with_background=True):
     perp_dx = math.cos(perp_angle) * (pencil_thickness * 0.5)
     perp_dy = math.sin(perp_angle) * (pencil_thickness * 0.5)
     
-    tip_points = [
-        (end_x + perp_dx, end_y + perp_dy),
-        (end_x - perp_dx, end_y - perp_dy),
-        (tip_x, tip_y)
-    ]
-    draw.polygon(tip_points, fill=yellow)
+    shapes.append(Polygon(((end_x + perp_dx, end_y + perp_dy),
+                           (end_x - perp_dx, end_y - perp_dy),
+                           (tip_x, tip_y)), yellow))
     
-    # Draw yellow dot on pencil body
+    # Yellow dot on pencil body
     dot_x = center_x - dx * 0.3
     dot_y = center_y - dy * 0.3
     dot_radius = pencil_thickness * 0.25
-    draw.ellipse(
-        [dot_x - dot_radius, dot_y - dot_radius,
-         dot_x + dot_radius, dot_y + dot_radius],
-        fill=yellow
-    )
+    shapes.append(Ellipse((dot_x - dot_radius, dot_y - dot_radius,
+                           dot_x + dot_radius, dot_y + dot_radius), yellow))
+    return shapes
 
 
-def create_app_icon(output_path, size):
-    """Create app icon at specified size"""
+@profiling.timed("draw")
+def draw_pebblenote_icon(draw, size, with_background=True):
+    """Draw the PebbleNote icon design matching the app's brand icon"""
+    rasterize(draw, pebblenote_shapes(size, with_background))
+
+
+def master_icon():
+    """Resize pyramid over the icon drawn once at MASTER_SIZE (cached per run)"""
+    global _master_pyramid
+    if _master_pyramid is None:
+        master = Image.new('RGBA', (MASTER_SIZE, MASTER_SIZE), (0, 0, 0, 0))
+        draw_pebblenote_icon(ImageDraw.Draw(master), MASTER_SIZE)
+        _master_pyramid = ResizePyramid(master)
+    return _master_pyramid
+
+
+def render_app_icon(size):
+    """The app icon at `size`, downsampled from the master or drawn directly"""
+    if SUPERSAMPLE:
+        return master_icon().resize(size)
     image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(image)
-    draw_pebblenote_icon(draw, size)
-    image.save(output_path, 'PNG')
-    print(f"Created: {output_path} ({size}x{size})")
+    draw_pebblenote_icon(ImageDraw.Draw(image), size)
+    return image
+
+
+def _icon_key(manifest, generator, size):
+    return manifest.input_key(generator, size=size, mode='RGBA',
+                              supersample=MASTER_SIZE if SUPERSAMPLE else None)
+
+
+def create_app_icon(output_paths, size, manifest=None):
+    """
+    Create app icon at specified size.
+    
+    `output_paths` may be a single path or a list of paths that all get the
+    same image - it is drawn and encoded once and the bytes copied.
+    """
+    if isinstance(output_paths, str):
+        output_paths = [output_paths]
+    
+    if manifest:
+        key = _icon_key(manifest, create_app_icon, size)
+        if all(manifest.is_fresh(path, key) for path in output_paths):
+            for path in output_paths:
+                print(f"Up to date: {path} ({size}x{size})")
+            return
+    
+    with profiling.target(output_paths[0]):
+        save_copies(render_app_icon(size), output_paths, 'PNG')
+    for path in output_paths:
+        if manifest:
+            manifest.record(path, key)
+        print(f"Created: {path} ({size}x{size})")
 
 
-def create_playstore_icon():
+def create_playstore_icon(manifest=None):
     """Create 512x512 Play Store icon"""
     size = 512
-    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(image)
-    draw_pebblenote_icon(draw, size)
-    
     output_dir = "assets/playstore"
     os.makedirs(output_dir, exist_ok=True)
     output_path = os.path.join(output_dir, "app_icon_512.png")
-    image.save(output_path, 'PNG')
+    
+    if manifest:
+        key = _icon_key(manifest, create_playstore_icon, size)
+        if manifest.is_fresh(output_path, key):
+            print(f"Up to date: {output_path}")
+            return output_path
+    
+    with profiling.target(output_path):
+        save_png(render_app_icon(size), output_path)
+    if manifest:
+        manifest.record(output_path, key)
     print(f"Created Play Store icon: {output_path}")
     return output_path
 
 
-def create_feature_graphic():
+def create_feature_graphic(manifest=None):
     """Create 1024x500 feature graphic for Play Store"""
     width, height = 1024, 500
+    output_dir = "assets/playstore"
+    output_path = os.path.join(output_dir, "feature_graphic.png")
+    
+    if manifest:
+        key = manifest.input_key(create_feature_graphic, size=(width, height), mode='RGB')
+        if manifest.is_fresh(output_path, key):
+            print(f"Up to date: {output_path}")
+            return output_path
+    
+    with profiling.target(output_path):
+        _draw_feature_graphic(output_path, width, height)
+    if manifest:
+        manifest.record(output_path, key)
+    print(f"Created feature graphic: {output_path}")
+    return output_path
+
+
+def _draw_feature_graphic(output_path, width, height):
+    """Draw and save the feature graphic"""
     orange = (255, 149, 0)
+    output_dir = os.path.dirname(output_path)
     
     image = Image.new('RGB', (width, height), orange)
     draw = ImageDraw.Draw(image)
@@ -174,51 +236,35 @@ def create_feature_graphic():
     draw_pebblenote_icon(icon_draw, icon_size, with_background=False)
     
     # Paste icon onto feature graphic
-    image.paste(icon_img, (icon_x, icon_y), icon_img)
+    with profiling.stage("composite"):
+        image.paste(icon_img, (icon_x, icon_y), icon_img)
     
     # Add app name text
     try:
-        # Try different font options
-        font_paths = [
-            "C:\\Windows\\Fonts\\segoeui.ttf",
-            "C:\\Windows\\Fonts\\arial.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        ]
-        font = None
-        for fp in font_paths:
-            if os.path.exists(fp):
-                font = ImageFont.truetype(fp, 72)
-                break
-        if font is None:
-            font = ImageFont.load_default()
+        font = get_font("sans", 72)
             
         # Draw "PebbleNote" text
         text = "PebbleNote"
         text_color = (255, 255, 255)  # White
         text_x = icon_x + icon_size + 80
         text_y = height // 2 - 60
-        draw.text((text_x, text_y), text, fill=text_color, font=font)
+        with profiling.stage("text"):
+            draw.text((text_x, text_y), text, fill=text_color, font=font)
         
         # Draw tagline
-        try:
-            small_font = ImageFont.truetype(font_paths[0] if os.path.exists(font_paths[0]) else font_paths[1], 32)
-        except:
-            small_font = font
+        small_font = get_font("sans", 32)
         tagline = "Capture Your Thoughts"
-        draw.text((text_x, text_y + 90), tagline, fill=(255, 240, 200), font=small_font)
+        with profiling.stage("text"):
+            draw.text((text_x, text_y + 90), tagline, fill=(255, 240, 200), font=small_font)
         
     except Exception as e:
         print(f"Font error: {e}")
     
-    output_dir = "assets/playstore"
     os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, "feature_graphic.png")
-    image.save(output_path, 'PNG')
-    print(f"Created feature graphic: {output_path}")
-    return output_path
+    save_png(image, output_path)
 
 
-def create_android_icons():
+def create_android_icons(manifest=None):
     """Create Android launcher icons in all required sizes"""
     sizes = {
         'mipmap-mdpi': 48,
@@ -234,16 +280,14 @@ def create_android_icons():
         folder_path = os.path.join(base_path, folder)
         os.makedirs(folder_path, exist_ok=True)
         
-        # Create launcher icon
+        # Launcher icon plus round icon (same as regular for now, so
+        # rendered once and written to both)
         output_path = os.path.join(folder_path, "ic_launcher.png")
-        create_app_icon(output_path, size)
-        
-        # Also create round icon (same as regular for now)
         round_path = os.path.join(folder_path, "ic_launcher_round.png")
-        create_app_icon(round_path, size)
+        create_app_icon([output_path, round_path], size, manifest)
 
 
-def create_ios_icons():
+def create_ios_icons(manifest=None):
     """Create iOS app icons"""
     sizes = [20, 29, 40, 58, 60, 76, 80, 87, 120, 152, 167, 180, 1024]
     
@@ -252,10 +296,20 @@ def create_ios_icons():
     
     for size in sizes:
         output_path = os.path.join(ios_path, f"Icon-App-{size}x{size}@1x.png")
-        create_app_icon(output_path, size)
+        create_app_icon(output_path, size, manifest)
 
 
 def main():
+    global SUPERSAMPLE
+    parser = argparse.ArgumentParser(description="Generate Play Store assets for PebbleNote")
+    parser.add_argument("--no-supersample", action="store_true",
+                        help="draw every icon size directly instead of downsampling "
+                             f"one {MASTER_SIZE}px master (aliased small sizes)")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start(args)
+    SUPERSAMPLE = not args.no_supersample
+    
     print("=" * 50)
     print("PebbleNote - Play Store Asset Generator")
     print("=" * 50)
@@ -264,23 +318,27 @@ def main():
     # Create Play Store assets directory
     os.makedirs("assets/playstore", exist_ok=True)
     
+    # Outputs whose drawing code and parameters are unchanged are skipped
+    manifest = AssetManifest()
+    
     # 1. Create Play Store icon (512x512)
     print("\n[1/4] Creating Play Store icon (512x512)...")
-    create_playstore_icon()
+    create_playstore_icon(manifest)
     
     # 2. Create Feature Graphic (1024x500)
     print("\n[2/4] Creating Feature Graphic (1024x500)...")
-    create_feature_graphic()
+    create_feature_graphic(manifest)
     
     # 3. Create Android launcher icons
     print("\n[3/4] Creating Android launcher icons...")
-    create_android_icons()
+    create_android_icons(manifest)
     
     # 4. Create main app icon (1024x1024 for store)
     print("\n[4/4] Creating high-res icon (1024x1024)...")
     os.makedirs("assets/icon", exist_ok=True)
-    create_app_icon("assets/icon/app_icon.png", 1024)
-    create_app_icon("assets/playstore/app_icon_1024.png", 1024)
+    create_app_icon(["assets/icon/app_icon.png", "assets/playstore/app_icon_1024.png"], 1024, manifest)
+    
+    manifest.save()
     
     print("\n" + "=" * 50)
     print("✅ All assets created successfully!")
@@ -291,6 +349,8 @@ def main():
     print("  - assets/playstore/feature_graphic.png (Feature graphic)")
     print("  - android/app/src/main/res/mipmap-*/ic_launcher.png (Android icons)")
     print("  - assets/icon/app_icon.png (Main app icon)")
+    writer.print_summary()
+    profiling.finish(args)
 
 
 if __name__ == "__main__":
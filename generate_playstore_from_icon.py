@@ -4,68 +4,103 @@ Generate Play Store assets from existing icon file
 Uses assets/icon/icon.png as the source
 """
 
+import argparse
+import contextlib
+import io
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-try:
-    from PIL import Image, ImageDraw, ImageFont, ImageFilter
-except ImportError:
-    print("Installing Pillow...")
-    os.system("pip install Pillow")
-    from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import Image, ImageDraw, ImageFilter
 
+from pebble_assets import build, profiling, writer
+from pebble_assets.encoder import (ANDROID_FORMAT_ENV, ANDROID_FORMATS, DEFAULT_PROFILE, PROFILE_ENV,
+                                   PROFILES, save_png, set_android_format, set_palette, set_profile)
+from pebble_assets.fonts import get_font, resolve
+from pebble_assets.gradients import falloff_gradient
+from pebble_assets.ico import ico_sizes, save_ico
+from pebble_assets.manifest import AssetManifest
+from pebble_assets.outputs import group_targets, save_copies
+from pebble_assets.pyramid import source_pyramid
+from pebble_assets.source_cache import load_source
 
-def resize_icon(source_path, output_path, size):
-    """Resize icon to specified size with high quality"""
-    img = Image.open(source_path)
-    
-    # Convert to RGBA if needed
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
-    
-    # Use high-quality resampling
-    resized = img.resize((size, size), Image.Resampling.LANCZOS)
-    resized.save(output_path, 'PNG')
-    print(f"Created: {output_path} ({size}x{size})")
+# Feature graphic text faces (pebble_assets.fonts families)
+FEATURE_FONTS = {'title': "sans-bold", 'tagline': "sans"}
+
+
+def render_icon(source_path, output_paths, size):
+    """Render one icon size from the shared source pyramid to every output path"""
+    with profiling.target(output_paths[0]):
+        resized = source_pyramid(source_path).resize(size)
+        save_copies(resized, output_paths, 'PNG')
+    for output_path in output_paths:
+        print(f"Created: {output_path} ({size}x{size})")
+
+
+def render_ico(source_path, output_path, largest=256):
+    """Pack the shared pyramid's frames (16 px up to `largest`) into one .ico"""
+    sizes = ico_sizes(largest)
+    with profiling.target(output_path):
+        save_ico(source_pyramid(source_path).resize_all(sizes), output_path)
+    print(f"Created: {output_path} ({', '.join(map(str, sizes))} px)")
+
+
+def resize_icons(source_path, targets):
+    """Resize icon to every (output_path, size) target, rendering each size once"""
+    groups = group_targets(targets)
+    # One largest-first pass over the pyramid; render_icon then reuses the frames
+    with profiling.target(source_path):
+        source_pyramid(source_path).resize_all([size for size, _ in groups])
+    for size, output_paths in groups:
+        render_icon(source_path, output_paths, size)
+
+
+def icon_targets(name):
+    """(output_path, size) targets of an asset_spec.json target"""
+    return list(build.spec_target(name)['outputs'].items())
 
 
 def create_playstore_icons(source_icon):
     """Create Play Store icons from source icon"""
-    output_dir = "assets/playstore"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # 512x512 Play Store icon
-    resize_icon(source_icon, os.path.join(output_dir, "app_icon_512.png"), 512)
-    
-    # 1024x1024 high-res icon
-    resize_icon(source_icon, os.path.join(output_dir, "app_icon_1024.png"), 1024)
+    resize_icons(source_icon, icon_targets('playstore-icons'))
 
 
-def create_feature_graphic(source_icon):
+def feature_graphic_sources(source_icon):
+    """The icon and font files the feature graphic is drawn from (for manifest keys)"""
+    return [source_icon, *[resolve(family) for family in FEATURE_FONTS.values()]]
+
+
+def create_feature_graphic(source_icon, output_path="assets/playstore/feature_graphic.png"):
     """Create 1024x500 feature graphic for Play Store - Modern clean design"""
+    for warning in render_feature_graphic(source_icon, output_path):
+        print(warning)
+    print(f"Created feature graphic: {output_path}")
+
+
+def render_feature_graphic(source_icon, output_path):
+    """Draw and save the feature graphic, returning its warnings instead of printing them"""
+    with profiling.target(output_path):
+        return _draw_feature_graphic(source_icon, output_path)
+
+
+def _draw_feature_graphic(source_icon, output_path):
+    """Draw and save the feature graphic; returns any font warnings"""
     width, height = 1024, 500
+    log = []
     
-    # Modern clean white/light gray gradient background
-    image = Image.new('RGB', (width, height), (255, 255, 255))
-    draw = ImageDraw.Draw(image)
-    
-    # Create subtle gradient from light gray to white
-    for y in range(height):
-        # Subtle vertical gradient
-        gray_value = int(248 + (y / height) * 7)  # 248 to 255
-        for x in range(width):
-            # Add slight horizontal variation for depth
-            h_factor = abs(x - width/2) / (width/2)
-            final_gray = int(gray_value - h_factor * 3)
-            image.putpixel((x, y), (final_gray, final_gray, final_gray))
+    # Modern clean background: subtle vertical gradient from light gray
+    # (248) to white (255), with slight horizontal falloff for depth
+    with profiling.stage("draw"):
+        image = falloff_gradient((width, height), (248, 248, 248), (255, 255, 255), 3)
     
     draw = ImageDraw.Draw(image)
     
     # Load icon
-    icon = Image.open(source_icon).convert('RGBA')
+    icon = load_source(source_icon)
     
     # Resize icon
     icon_size = 300
-    icon_resized = icon.resize((icon_size, icon_size), Image.Resampling.LANCZOS)
+    with profiling.stage("resample"):
+        icon_resized = icon.resize((icon_size, icon_size), Image.Resampling.LANCZOS)
     
     # Position icon on the left
     icon_x = 150
@@ -77,46 +112,23 @@ def create_feature_graphic(source_icon):
     shadow_draw = ImageDraw.Draw(shadow)
     shadow_draw.rounded_rectangle([20, 20, shadow_size - 20, shadow_size - 20], 
                                    radius=50, fill=(0, 0, 0, 25))
-    shadow = shadow.filter(ImageFilter.GaussianBlur(15))
-    
-    # Paste shadow and icon
-    image.paste(shadow, (icon_x - 20, icon_y - 10), shadow)
+    with profiling.stage("filter"):
+        shadow = shadow.filter(ImageFilter.GaussianBlur(15))
     
-    # Create a white backing for the icon for clean look
-    icon_bg = Image.new('RGBA', (icon_size, icon_size), (255, 255, 255, 255))
-    image.paste(icon_bg, (icon_x, icon_y))
-    image.paste(icon_resized, (icon_x, icon_y), icon_resized)
+    with profiling.stage("composite"):
+        # Paste shadow and icon
+        image.paste(shadow, (icon_x - 20, icon_y - 10), shadow)
+        
+        # Create a white backing for the icon for clean look
+        icon_bg = Image.new('RGBA', (icon_size, icon_size), (255, 255, 255, 255))
+        image.paste(icon_bg, (icon_x, icon_y))
+        image.paste(icon_resized, (icon_x, icon_y), icon_resized)
     
     # Add app name text with modern styling
     try:
-        # Try to get a nice font
-        font_paths_bold = [
-            "C:\\Windows\\Fonts\\segoeuib.ttf",
-            "C:\\Windows\\Fonts\\arialbd.ttf",
-            "C:\\Windows\\Fonts\\segoeui.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-        ]
-        font_paths_regular = [
-            "C:\\Windows\\Fonts\\segoeui.ttf",
-            "C:\\Windows\\Fonts\\arial.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        ]
-        
-        title_font = None
-        for fp in font_paths_bold:
-            if os.path.exists(fp):
-                title_font = ImageFont.truetype(fp, 72)
-                break
-        if title_font is None:
-            title_font = ImageFont.load_default()
-        
-        tagline_font = None
-        for fp in font_paths_regular:
-            if os.path.exists(fp):
-                tagline_font = ImageFont.truetype(fp, 28)
-                break
-        if tagline_font is None:
-            tagline_font = title_font
+        # Bold title and regular tagline from the shared font registry
+        title_font = get_font(FEATURE_FONTS['title'], 72)
+        tagline_font = get_font(FEATURE_FONTS['tagline'], 28)
         
         # App name - dark gray for modern look
         text = "PebbleNote"
@@ -124,12 +136,14 @@ def create_feature_graphic(source_icon):
         text_x = icon_x + icon_size + 80
         text_y = height // 2 - 55
         
-        draw.text((text_x, text_y), text, fill=text_color, font=title_font)
+        with profiling.stage("text"):
+            draw.text((text_x, text_y), text, fill=text_color, font=title_font)
         
         # Tagline - lighter gray
         tagline = "Capture Your Thoughts"
         tagline_color = (128, 128, 128)  # Medium gray
-        draw.text((text_x, text_y + 85), tagline, fill=tagline_color, font=tagline_font)
+        with profiling.stage("text"):
+            draw.text((text_x, text_y + 85), tagline, fill=tagline_color, font=tagline_font)
         
         # Add subtle orange accent line under the title
         orange_accent = (255, 149, 0)  # Brand orange
@@ -137,109 +151,162 @@ def create_feature_graphic(source_icon):
         draw.rectangle([text_x, line_y, text_x + 60, line_y + 3], fill=orange_accent)
         
     except Exception as e:
-        print(f"Font error (using default): {e}")
+        log.append(f"Font error (using default): {e}")
     
-    output_dir = "assets/playstore"
-    os.makedirs(output_dir, exist_ok=True)
-    output_path = os.path.join(output_dir, "feature_graphic.png")
-    image.save(output_path, 'PNG')
-    print(f"Created feature graphic: {output_path}")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    save_png(image, output_path)
+    return log
 
 
 def create_android_icons(source_icon):
     """Create Android launcher icons in all required sizes"""
-    sizes = {
-        'mipmap-mdpi': 48,
-        'mipmap-hdpi': 72,
-        'mipmap-xhdpi': 96,
-        'mipmap-xxhdpi': 144,
-        'mipmap-xxxhdpi': 192,
-    }
-    
-    base_path = "android/app/src/main/res"
-    
-    for folder, size in sizes.items():
-        folder_path = os.path.join(base_path, folder)
-        os.makedirs(folder_path, exist_ok=True)
-        
-        # Create launcher icon
-        output_path = os.path.join(folder_path, "ic_launcher.png")
-        resize_icon(source_icon, output_path, size)
-        
-        # Also create round icon
-        round_path = os.path.join(folder_path, "ic_launcher_round.png")
-        resize_icon(source_icon, round_path, size)
+    resize_icons(source_icon, icon_targets('android-icons'))
 
 
 def create_ios_icons(source_icon):
     """Create iOS app icons in all required sizes"""
-    # iOS requires specific sizes with @1x, @2x, @3x variants
-    ios_icons = [
-        # iPhone
-        ("Icon-App-20x20@2x.png", 40),
-        ("Icon-App-20x20@3x.png", 60),
-        ("Icon-App-29x29@1x.png", 29),
-        ("Icon-App-29x29@2x.png", 58),
-        ("Icon-App-29x29@3x.png", 87),
-        ("Icon-App-40x40@2x.png", 80),
-        ("Icon-App-40x40@3x.png", 120),
-        ("Icon-App-60x60@2x.png", 120),
-        ("Icon-App-60x60@3x.png", 180),
-        # iPad
-        ("Icon-App-20x20@1x.png", 20),
-        ("Icon-App-29x29@1x.png", 29),
-        ("Icon-App-40x40@1x.png", 40),
-        ("Icon-App-76x76@1x.png", 76),
-        ("Icon-App-76x76@2x.png", 152),
-        ("Icon-App-83.5x83.5@2x.png", 167),
-        # App Store
-        ("Icon-App-1024x1024@1x.png", 1024),
-        # Additional sizes for compatibility
-        ("Icon-App-50x50@1x.png", 50),
-        ("Icon-App-50x50@2x.png", 100),
-        ("Icon-App-57x57@1x.png", 57),
-        ("Icon-App-57x57@2x.png", 114),
-        ("Icon-App-72x72@1x.png", 72),
-        ("Icon-App-72x72@2x.png", 144),
-        ("Icon-App-60x60@1x.png", 60),
-        ("Icon-App-80x80@1x.png", 80),
-        ("Icon-App-87x87@1x.png", 87),
-        ("Icon-App-120x120@1x.png", 120),
-        ("Icon-App-152x152@1x.png", 152),
-        ("Icon-App-167x167@1x.png", 167),
-        ("Icon-App-180x180@1x.png", 180),
-    ]
-    
-    ios_path = "ios/Runner/Assets.xcassets/AppIcon.appiconset"
-    os.makedirs(ios_path, exist_ok=True)
-    
-    for filename, size in ios_icons:
-        output_path = os.path.join(ios_path, filename)
-        resize_icon(source_icon, output_path, size)
+    resize_icons(source_icon, icon_targets('ios-icons'))
 
 
 def create_web_icons(source_icon):
     """Create web icons"""
-    web_path = "web/icons"
-    os.makedirs(web_path, exist_ok=True)
-    
-    sizes = [192, 512]
-    for size in sizes:
-        output_path = os.path.join(web_path, f"Icon-{size}.png")
-        resize_icon(source_icon, output_path, size)
+    resize_icons(source_icon, icon_targets('web-icons'))
+
+
+def create_windows_icon(source_icon):
+    """Create the multi-size Windows app icon"""
+    for output_path, largest in icon_targets('windows-icon'):
+        render_ico(source_icon, output_path, largest)
+
+
+def build_stages(source_icon, manifest):
+    """
+    Every output of a full run, grouped by stage.
+    
+    Returns [(title, [(output_paths, key, func, args)])] where `key` is the
+    manifest hash of the task's inputs. Targets of the same size share one
+    task, so each unique image is rendered and encoded once.
+    """
+    def icon_tasks(targets):
+        return [
+            (paths, manifest.input_key(render_icon, sources=[source_icon],
+                                       size=size, mode='RGBA'),
+             render_icon, (source_icon, paths, size))
+            for size, paths in group_targets(targets)
+        ]
     
-    # Also create maskable icons
-    for size in sizes:
-        output_path = os.path.join(web_path, f"Icon-maskable-{size}.png")
-        resize_icon(source_icon, output_path, size)
+    ico_tasks = [
+        ([path], manifest.input_key(render_ico, sources=[source_icon], size=largest, mode='RGBA'),
+         render_ico, (source_icon, path, largest))
+        for path, largest in icon_targets('windows-icon')
+    ]
+    feature_tasks = [
+        ([path], manifest.input_key(create_feature_graphic, sources=feature_graphic_sources(source_icon),
+                                    size=tuple(size), mode='RGB'),
+         create_feature_graphic, (source_icon, path))
+        for path, size in icon_targets('feature-graphic')
+    ]
     
-    # Create favicon (16x16 and 32x32, save as ICO or PNG)
-    favicon_path = "web/favicon.png"
-    resize_icon(source_icon, favicon_path, 32)
-    print(f"Created: {favicon_path} (32x32)")
+    return [
+        ("[1/5] Creating Play Store icons...", icon_tasks(icon_targets('playstore-icons'))),
+        ("[2/5] Creating Feature Graphic (1024x500)...", feature_tasks),
+        ("[3/5] Creating Android launcher icons...", icon_tasks(icon_targets('android-icons'))),
+        ("[4/5] Creating iOS icons...", icon_tasks(icon_targets('ios-icons'))),
+        ("[5/5] Creating Web and Windows icons...",
+         icon_tasks(icon_targets('web-icons')) + ico_tasks),
+    ]
+
+
+def run_stages(stages, manifest):
+    """Run every stale task in order on the current process"""
+    for title, tasks in stages:
+        print(f"\n{title}")
+        for output_paths, key, func, args in tasks:
+            if all(manifest.is_fresh(path, key) for path in output_paths):
+                for path in output_paths:
+                    print(f"Up to date: {path}")
+                continue
+            func(*args)
+            for path in output_paths:
+                manifest.record(path, key)
+
+
+def _warm_worker(source_icon, profile=False):
+    """Pool initializer: decode the source once per worker process"""
+    if profile:
+        # Workers only record; the parent merges their spans and writes the trace
+        profiling.enable(None)
+    source_pyramid(source_icon)
+
+
+def _run_captured(func, *args):
+    """
+    Run a task in a worker, returning its console output instead of printing
+    it, plus any profiling spans and output writes it recorded.
+    """
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        func(*args)
+    return buffer.getvalue(), profiling.drain(), writer.drain()
+
+
+def run_stages_parallel(stages, manifest, jobs, source_icon):
+    """
+    Run every stale output image as an independent task on a process pool.
+    
+    Output is collected per task and printed in submission order, so the
+    console log is grouped by stage and identical to a serial run.
+    """
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_warm_worker,
+                             initargs=(source_icon, profiling.enabled())) as pool:
+        submitted = []
+        for title, tasks in stages:
+            futures = []
+            for output_paths, key, func, args in tasks:
+                future = None
+                if not all(manifest.is_fresh(path, key) for path in output_paths):
+                    future = pool.submit(_run_captured, func, *args)
+                futures.append((output_paths, key, future))
+            submitted.append((title, futures))
+        
+        for title, futures in submitted:
+            print(f"\n{title}")
+            for output_paths, key, future in futures:
+                if future is None:
+                    for path in output_paths:
+                        print(f"Up to date: {path}")
+                    continue
+                output, events, writes = future.result()
+                print(output, end='')
+                profiling.merge(events)
+                writer.merge(writes)
+                for path in output_paths:
+                    manifest.record(path, key)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate Play Store assets from the existing icon")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="worker processes for rendering outputs (0 = all cores, default 1)")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every output, ignoring the asset manifest")
+    parser.add_argument("--png-profile", choices=sorted(PROFILES),
+                        help=f"PNG encoder profile (default: ${PROFILE_ENV} or {DEFAULT_PROFILE})")
+    parser.add_argument("--android-format", choices=ANDROID_FORMATS,
+                        help=f"format of Android mipmap outputs (default: ${ANDROID_FORMAT_ENV} or png)")
+    parser.add_argument("--png-palette", action="store_true",
+                        help="store low-colour PNGs as 8-bit palette images")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.start(args)
+    if args.png_palette:
+        set_palette(True)
+    if args.png_profile:
+        set_profile(args.png_profile)
+    if args.android_format:
+        set_android_format(args.android_format)
+    jobs = args.jobs or os.cpu_count()
+    
     print("=" * 50)
     print("PebbleNote - Play Store Asset Generator")
     print("(From existing icon)")
@@ -254,33 +321,23 @@ def main():
     
     print(f"Source icon: {source_icon}")
     
-    # Get source icon info
-    img = Image.open(source_icon)
+    # Get source icon info (decoded once; forked workers inherit it)
+    img = load_source(source_icon)
     print(f"Source size: {img.width}x{img.height}")
     print()
     
     # Create Play Store assets directory
     os.makedirs("assets/playstore", exist_ok=True)
     
-    # 1. Create Play Store icons
-    print("\n[1/5] Creating Play Store icons...")
-    create_playstore_icons(source_icon)
-    
-    # 2. Create Feature Graphic
-    print("\n[2/5] Creating Feature Graphic (1024x500)...")
-    create_feature_graphic(source_icon)
-    
-    # 3. Create Android launcher icons
-    print("\n[3/5] Creating Android launcher icons...")
-    create_android_icons(source_icon)
-    
-    # 4. Create iOS icons
-    print("\n[4/5] Creating iOS icons...")
-    create_ios_icons(source_icon)
-    
-    # 5. Create Web icons
-    print("\n[5/5] Creating Web icons...")
-    create_web_icons(source_icon)
+    # Play Store icons, feature graphic, Android, iOS and web icons.
+    # Outputs whose inputs are unchanged since the last run are skipped.
+    manifest = AssetManifest(force=args.force or None)
+    stages = build_stages(source_icon, manifest)
+    if jobs > 1:
+        run_stages_parallel(stages, manifest, jobs, source_icon)
+    else:
+        run_stages(stages, manifest)
+    manifest.save()
     
     print("\n" + "=" * 50)
     print("✅ All assets created successfully!")
@@ -297,6 +354,11 @@ def main():
     print("    - ios/Runner/Assets.xcassets/AppIcon.appiconset/*.png")
     print("  Web:")
     print("    - web/icons/Icon-*.png")
+    print("    - web/favicon.png")
+    print("  Windows:")
+    print("    - windows/runner/resources/app_icon.ico")
+    writer.print_summary()
+    profiling.finish(args)
 
 
 if __name__ == "__main__":
@@ -1,96 +1,57 @@
 """
 Generate Android splash screen images from the provided PebbleNote logo image.
 Creates density-specific versions for all Android drawable folders.
+
+The densities are the `android-splash` target in asset_spec.json; this
+script builds that target.
 """
 
 from PIL import Image
-import os
+import sys
 
-# Android density specifications for splash screens
-# Format: (folder_suffix, width, height)
-DENSITIES = [
-    ('mdpi', 320, 480),
-    ('hdpi', 480, 800),
-    ('xhdpi', 720, 1280),
-    ('xxhdpi', 1080, 1920),
-    ('xxxhdpi', 1440, 2560),
-]
+from pebble_assets import build, profiling
 
-def generate_splash_images(source_image_path: str, output_base_path: str):
+def fit_on_canvas(source, width, height, background=(255, 149, 0)):
     """
-    Generate splash images for all Android densities from source image.
-    
-    Args:
-        source_image_path: Path to the source splash image
-        output_base_path: Base path for Android res folder
+    Scale `source` to fit width x height keeping its aspect ratio, centered
+    on a solid background (#FF9500 by default). Returns an RGB image.
     """
-    # Load source image
-    source = Image.open(source_image_path)
-    print(f"✅ Loaded source image: {source.size[0]}x{source.size[1]}")
+    # Calculate scaling to fit the target dimensions while maintaining aspect ratio
+    source_ratio = source.width / source.height
+    target_ratio = width / height
     
-    # Convert to RGBA if needed
-    if source.mode != 'RGBA':
-        source = source.convert('RGBA')
+    if source_ratio > target_ratio:
+        # Source is wider - fit to width
+        new_width = width
+        new_height = int(width / source_ratio)
+    else:
+        # Source is taller - fit to height
+        new_height = height
+        new_width = int(height * source_ratio)
     
-    for folder_suffix, width, height in DENSITIES:
-        # Calculate scaling to fit the target dimensions while maintaining aspect ratio
-        source_ratio = source.width / source.height
-        target_ratio = width / height
-        
-        if source_ratio > target_ratio:
-            # Source is wider - fit to width
-            new_width = width
-            new_height = int(width / source_ratio)
-        else:
-            # Source is taller - fit to height
-            new_height = height
-            new_width = int(height * source_ratio)
-        
-        # Resize source image with high quality
+    # Resize source image with high quality
+    with profiling.stage("resample"):
         resized = source.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Create target canvas with orange background
-        canvas = Image.new('RGBA', (width, height), (255, 149, 0, 255))  # #FF9500
-        
-        # Center the resized image on canvas
-        x_offset = (width - new_width) // 2
-        y_offset = (height - new_height) // 2
-        
-        # Paste with alpha compositing
+    
+    # Create target canvas with orange background
+    canvas = Image.new('RGBA', (width, height), tuple(background[:3]) + (255,))
+    
+    # Center the resized image on canvas
+    x_offset = (width - new_width) // 2
+    y_offset = (height - new_height) // 2
+    
+    # Paste with alpha compositing
+    with profiling.stage("composite"):
         canvas.paste(resized, (x_offset, y_offset), resized)
         
         # Convert to RGB for PNG output (no transparency needed)
-        final = canvas.convert('RGB')
-        
-        # Determine output folder
-        if folder_suffix == 'mdpi':
-            folder_name = 'drawable'
-        else:
-            folder_name = f'drawable-{folder_suffix}'
-        
-        output_folder = os.path.join(output_base_path, folder_name)
-        os.makedirs(output_folder, exist_ok=True)
-        
-        output_path = os.path.join(output_folder, 'launch_image.png')
-        final.save(output_path, 'PNG', optimize=True)
-        print(f"✅ Generated {folder_name}/launch_image.png ({width}x{height})")
+        return canvas.convert('RGB')
 
-def main():
-    # Source image path (the attached image saved here)
-    source_image = 'assets/icon/splash_logo.png'
-    
-    # Android res folder
-    output_base = 'android/app/src/main/res'
-    
-    if not os.path.exists(source_image):
-        print(f"❌ Source image not found: {source_image}")
-        print("Please save the splash logo image to assets/icon/splash_logo.png")
-        return
-    
-    print("🚀 Generating Android splash screen images...")
-    generate_splash_images(source_image, output_base)
-    print("\n✅ All splash images generated successfully!")
-    print("\nNext: Run 'flutter build apk --debug' to test")
+def main(argv=None):
+    # `android-splash` fits the designer's splash_logo.png onto every
+    # density's canvas; build flags (--force, --png-profile, --profile, ...)
+    # pass straight through
+    return build.main(["android-splash"] + list(sys.argv[1:] if argv is None else argv))
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
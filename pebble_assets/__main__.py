@@ -0,0 +1,7 @@
+"""Allow `python -m pebble_assets` as an alias for the pebble-assets command"""
+
+import sys
+
+from pebble_assets.cli import main
+
+sys.exit(main())
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the asset generator scripts.
+
+Every benchmark runs one generator script in a fresh subprocess against
+synthetic fixture sources in a temp directory, so it never touches the real
+assets, needs no Windows fonts and never goes to the network (sockets are
+disabled in the child). For each script it records wall time, CPU time,
+peak RSS and the bytes written per output file.
+
+Results are written as JSON (tagged with the git commit) so runs can be
+compared across commits:
+
+    python -m pebble_assets.bench                        # all benchmarks
+    python -m pebble_assets.bench create_splash_images --repeat 3
+    python -m pebble_assets.bench --compare bench_results/OLD.json
+    python -m pebble_assets.bench --smoke                # does every benchmark still run?
+"""
+
+import argparse
+import json
+import os
+import platform
+import runpy
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import PIL
+from PIL import Image, ImageDraw
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "bench_results")
+
+# Benchmark name -> generator script (run as __main__ from the fixture dir)
+BENCHMARKS = {
+    "create_icon": "create_icon.py",
+    "create_pebble_logo": "create_pebble_logo.py",
+    "create_splash_images": "create_splash_images.py",
+    "generate_splash_from_image": "generate_splash_from_image.py",
+    "generate_playstore_assets": "generate_playstore_assets.py",
+    "generate_playstore_from_icon": "generate_playstore_from_icon.py",
+    "fix_icon_whitespace": "fix_icon_whitespace.py",
+    "fix_transparent_icon": "fix_transparent_icon.py",
+    "update_launcher_icon": "update_launcher_icon.py",
+    "update_foreground_icon": "update_foreground_icon.py",
+}
+
+ORANGE = (255, 149, 0)
+MIPMAPS = [('mipmap-mdpi', 48), ('mipmap-hdpi', 72), ('mipmap-xhdpi', 96),
+           ('mipmap-xxhdpi', 144), ('mipmap-xxxhdpi', 192)]
+
+
+def _fixture_logo(size, background):
+    """Deterministic stand-in for the P logo: white rounded shapes on a background"""
+    img = Image.new('RGBA', (size, size), background)
+    draw = ImageDraw.Draw(img)
+    s = size / 512
+    draw.rounded_rectangle([140 * s, 90 * s, 230 * s, 420 * s], radius=30 * s, fill='white')
+    draw.ellipse([150 * s, 90 * s, 390 * s, 300 * s], fill='white')
+    draw.ellipse([230 * s, 150 * s, 330 * s, 240 * s], fill=background)
+    return img
+
+
+def make_fixtures(workdir):
+    """Create the source images and output folders the generators expect"""
+    icon_dir = os.path.join(workdir, "assets", "icon")
+    os.makedirs(icon_dir, exist_ok=True)
+    _fixture_logo(512, ORANGE + (255,)).convert('RGB').save(os.path.join(icon_dir, "icon.png"))
+    _fixture_logo(512, (0, 0, 0, 0)).save(os.path.join(icon_dir, "icon_foreground.png"))
+    _fixture_logo(512, ORANGE + (255,)).convert('RGB').save(os.path.join(icon_dir, "p_logo.png"))
+
+    splash = Image.new('RGB', (1080, 1920), ORANGE)
+    splash.paste(_fixture_logo(400, ORANGE + (255,)), (340, 700))
+    splash.save(os.path.join(icon_dir, "splash_logo.png"))
+
+    res_dir = os.path.join(workdir, "android", "app", "src", "main", "res")
+    for folder, size in MIPMAPS:
+        os.makedirs(os.path.join(res_dir, folder), exist_ok=True)
+        # Launcher icons for the fix_* post-processors to work on
+        _fixture_logo(size, (0, 0, 0, 0)).save(os.path.join(res_dir, folder, "ic_launcher.png"))
+    os.makedirs(os.path.join(workdir, "web"), exist_ok=True)
+
+    # Every generator reads its target list from the spec
+    shutil.copy(os.path.join(REPO_ROOT, "asset_spec.json"), workdir)
+
+    # Bundled fonts, so nothing is downloaded
+    fonts_dir = os.path.join(REPO_ROOT, "fonts_cache")
+    if os.path.isdir(fonts_dir):
+        shutil.copytree(fonts_dir, os.path.join(workdir, "fonts_cache"))
+
+
+def _snapshot(workdir):
+    files = {}
+    for root, _, names in os.walk(workdir):
+        for name in names:
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            files[os.path.relpath(path, workdir)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _disable_network():
+    def blocked(*args, **kwargs):
+        raise OSError("network access is disabled during benchmarks")
+    socket.socket.connect = blocked
+    socket.socket.connect_ex = blocked
+
+
+def run_child(name, result_path=None):
+    """Runs inside the benchmark subprocess: execute one script and measure it (into `result_path`)"""
+    _disable_network()
+    script = os.path.join(REPO_ROOT, BENCHMARKS[name])
+    sys.argv = [script]
+    sys.path.insert(0, REPO_ROOT)
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        # Scripts ending in sys.exit(main()) still count as a run
+        if e.code not in (None, 0):
+            raise
+    result = {
+        "wall_s": time.perf_counter() - wall_start,
+        "cpu_s": time.process_time() - cpu_start,
+        "peak_rss_bytes": _peak_rss_bytes(),
+    }
+    if result_path:
+        with open(result_path, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+
+
+def run_benchmark(name, verbose=False):
+    """Run one benchmark in a fresh fixture dir, returning its measurements"""
+    with tempfile.TemporaryDirectory(prefix=f"bench-{name}-") as workdir:
+        make_fixtures(workdir)
+        before = _snapshot(workdir)
+        result_path = os.path.join(tempfile.gettempdir(), f"pebble-bench-{os.getpid()}-{name}.json")
+
+        env = dict(os.environ, PYTHONPATH=REPO_ROOT, PEBBLE_ASSETS_FORCE="1")
+        proc = subprocess.run(
+            [sys.executable, "-m", "pebble_assets.bench", "--child", name, "--result", result_path],
+            cwd=workdir, env=env,
+            stdout=None if verbose else subprocess.DEVNULL,
+            stderr=subprocess.PIPE, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{name} failed:\n{proc.stderr}")
+        with open(result_path, encoding="utf-8") as f:
+            result = json.load(f)
+        os.remove(result_path)
+
+        after = _snapshot(workdir)
+        written = {
+            path.replace(os.sep, "/"): stamp[0]
+            for path, stamp in sorted(after.items())
+            if before.get(path) != stamp
+        }
+        result["files_written"] = len(written)
+        result["bytes_written"] = sum(written.values())
+        result["outputs"] = written
+        return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_table(results, baseline=None):
+    print(f"\n{'benchmark':30} {'wall s':>8} {'cpu s':>8} {'peak MB':>8} {'files':>6} {'KB out':>9}")
+    for name, r in results.items():
+        peak = f"{r['peak_rss_bytes'] / 2**20:8.1f}" if r["peak_rss_bytes"] else f"{'-':>8}"
+        line = (f"{name:30} {r['wall_s']:8.3f} {r['cpu_s']:8.3f} {peak} "
+                f"{r['files_written']:6} {r['bytes_written'] / 1024:9.1f}")
+        if baseline and name in baseline:
+            old = baseline[name]["wall_s"]
+            line += f"   {(r['wall_s'] - old) / old * 100:+6.1f}% wall vs baseline"
+        print(line)
+
+
+def smoke(names, verbose=False):
+    """Run every benchmark in `names` once; 1 if any of them fails or writes nothing"""
+    failures = []
+    for name in names:
+        try:
+            result = run_benchmark(name, verbose)
+        except (OSError, RuntimeError, ValueError) as e:
+            failures.append(f"{name}: {e}")
+            print(f"❌ {name}")
+            continue
+        if not result["files_written"]:
+            failures.append(f"{name}: wrote no files")
+            print(f"❌ {name}")
+        else:
+            print(f"✅ {name}: {result['files_written']} file(s) in {result['wall_s']:.3f}s")
+    if failures:
+        print(f"\n{len(failures)} benchmark(s) failed:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print(f"\n✅ All {len(names)} benchmark(s) ran")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the asset generator scripts")
+    parser.add_argument("benchmarks", nargs="*", help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per benchmark; the fastest is kept")
+    parser.add_argument("--output", help="results file (default: bench_results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare wall times against")
+    parser.add_argument("--verbose", action="store_true", help="show the scripts' own output")
+    parser.add_argument("--smoke", action="store_true",
+                        help="run each benchmark once and only check that it succeeds and writes files")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, args.result)
+        return 0
+
+    names = args.benchmarks or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"❌ Unknown benchmark(s): {', '.join(unknown)}")
+        return 1
+
+    if args.smoke:
+        return smoke(names, args.verbose)
+
+    results = {}
+    for name in names:
+        runs = [run_benchmark(name, args.verbose) for _ in range(args.repeat)]
+        results[name] = min(runs, key=lambda r: r["wall_s"])
+        print(f"⏱️ {name}: {results[name]['wall_s']:.3f}s")
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    print_table(results, baseline)
+    print(f"\n📄 Results saved to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Dependency-graph build of every generated asset from asset_spec.json.
+
+Each spec target lists its input files and output files. An input that is
+produced by another target makes that target a dependency; inputs nobody
+produces are source images. Only the requested targets and the targets
+they depend on are built, independent branches run concurrently, and the
+asset manifest skips outputs that are already up to date.
+
+A target marked `"optional": true` is an alternative rendering of outputs
+another target owns (e.g. the branded splash vs. the fitted splash logo).
+It is only built when named, and its outputs never count as inputs for
+other targets.
+
+The generator scripts take their output lists from here too
+(`spec_target`), so every size lives in the spec only.
+
+Usage (from the repo root):
+    python -m pebble_assets.build                  # everything
+    python -m pebble_assets.build ios-icons web-icons
+    python -m pebble_assets.build --list
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from pebble_assets import profiling, writer
+from pebble_assets.builders import BUILDERS, estimate_peak_bytes
+from pebble_assets.encoder import (ANDROID_FORMAT_ENV, ANDROID_FORMATS, DEFAULT_PROFILE, PROFILE_ENV,
+                                   PROFILES, set_android_format, set_palette, set_profile)
+from pebble_assets.manifest import AssetManifest
+
+SPEC_PATH = "asset_spec.json"
+MEMORY_ENV = "PEBBLE_MAX_MEMORY_MB"
+
+
+def _check_target(name, target):
+    """ValueError unless `target` has the fields and types the builders rely on"""
+    if not isinstance(target, dict):
+        raise ValueError(f"Target '{name}' must be an object")
+    if not isinstance(target.get("builder"), str):
+        raise ValueError(f"Target '{name}' needs a \"builder\" name")
+    if not isinstance(target.get("outputs"), dict):
+        raise ValueError(f"Target '{name}' needs an \"outputs\" object")
+    if not isinstance(target.get("inputs", []), list):
+        raise ValueError(f"Target '{name}': \"inputs\" must be a list")
+    if not isinstance(target.get("params", {}), dict):
+        raise ValueError(f"Target '{name}': \"params\" must be an object")
+
+
+def load_spec(path=SPEC_PATH):
+    """
+    Read the spec, returning {target name: target} in declaration order.
+    A malformed spec raises ValueError (json.JSONDecodeError included).
+    """
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+    if not isinstance(spec, dict) or not isinstance(spec.get("targets"), dict):
+        raise ValueError(f"{path} needs a \"targets\" object")
+
+    targets = {}
+    producers = {}
+    for name, target in spec["targets"].items():
+        _check_target(name, target)
+        if target["builder"] not in BUILDERS:
+            raise ValueError(f"Target '{name}' uses unknown builder '{target['builder']}'")
+        target = dict(target, name=name)
+        targets[name] = target
+        if target.get("optional"):
+            continue
+        for output_path in target["outputs"]:
+            output_path = os.path.normpath(output_path)
+            if output_path in producers:
+                raise ValueError(
+                    f"{output_path} is produced by both '{producers[output_path]}' and '{name}'")
+            producers[output_path] = name
+
+    for target in targets.values():
+        target["deps"] = sorted({
+            producers[os.path.normpath(path)]
+            for path in target.get("inputs", [])
+            if os.path.normpath(path) in producers
+        })
+    return targets
+
+
+def spec_target(name, spec_path=SPEC_PATH):
+    """Target `name` from the spec, for scripts that render its outputs themselves"""
+    targets = load_spec(spec_path)
+    if name not in targets:
+        raise ValueError(f"Unknown target: {name}")
+    return targets[name]
+
+
+def plan(targets, requested=None):
+    """
+    Names of the requested targets (default: all but the optional ones) and
+    everything they depend on, in build order
+    """
+    requested = list(requested or [name for name, target in targets.items() if not target.get("optional")])
+    unknown = [name for name in requested if name not in targets]
+    if unknown:
+        raise ValueError(f"Unknown target(s): {', '.join(unknown)}")
+
+    order = []
+    state = {}
+
+    def visit(name, chain):
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' -> '.join(chain + [name])}")
+        state[name] = "visiting"
+        for dep in targets[name]["deps"]:
+            visit(dep, chain + [name])
+        state[name] = "done"
+        order.append(name)
+
+    for name in requested:
+        visit(name, [])
+    return order
+
+
+def run(targets, order, manifest, jobs=None, memory_limit=None):
+    """
+    Build `order` on a thread pool, starting each target once its
+    dependencies have finished. Each target's log is printed as one block.
+
+    With `memory_limit` (bytes) a ready target only starts while the
+    estimated peak memory of everything in flight stays under the limit;
+    a target that alone exceeds it runs by itself.
+    """
+    print_lock = threading.Lock()
+    remaining = {name: set(targets[name]["deps"]) & set(order) for name in order}
+    costs = {name: estimate_peak_bytes(targets[name]) if memory_limit else 0 for name in order}
+    in_flight = {}
+
+    def build(name):
+        target = targets[name]
+        missing = [path for path in target.get("inputs", []) if not os.path.exists(path)]
+        if missing:
+            raise FileNotFoundError(f"{name}: missing input(s) {', '.join(missing)}")
+        with profiling.target(name):
+            log = BUILDERS[target["builder"]](target, manifest)
+        with print_lock:
+            print(f"\n[{name}]")
+            for line in log:
+                print(f"  {line}")
+        return name
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        running = set()
+        while remaining or running:
+            ready = [name for name, deps in remaining.items() if not deps]
+            for name in ready:
+                if memory_limit and in_flight and sum(in_flight.values()) + costs[name] > memory_limit:
+                    continue
+                del remaining[name]
+                in_flight[name] = costs[name]
+                running.add(pool.submit(build, name))
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished = future.result()
+                del in_flight[finished]
+                for deps in remaining.values():
+                    deps.discard(finished)
+
+
+def main(argv=None, params=None):
+    """
+    Command-line build. `params` ({target name: params}) is merged over the
+    spec's params, for wrapper scripts that expose a target option as a flag.
+    """
+    parser = argparse.ArgumentParser(description="Build generated assets from asset_spec.json")
+    parser.add_argument("targets", nargs="*", help="targets to build (default: all)")
+    parser.add_argument("--spec", default=SPEC_PATH, help=f"spec file (default: {SPEC_PATH})")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="concurrent targets (default: all cores)")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every output, ignoring the asset manifest")
+    parser.add_argument("--png-profile", choices=sorted(PROFILES),
+                        help=f"PNG encoder profile (default: ${PROFILE_ENV} or {DEFAULT_PROFILE})")
+    parser.add_argument("--android-format", choices=ANDROID_FORMATS,
+                        help=f"format of Android drawable/mipmap outputs "
+                             f"(default: ${ANDROID_FORMAT_ENV} or png)")
+    parser.add_argument("--png-palette", action="store_true",
+                        help="store low-colour PNGs as 8-bit palette images")
+    parser.add_argument("--max-memory", type=int, metavar="MB",
+                        default=int(os.environ.get(MEMORY_ENV, 0)) or None,
+                        help=f"estimated peak memory ceiling for concurrent targets "
+                             f"(default: ${MEMORY_ENV} or unlimited)")
+    parser.add_argument("--list", action="store_true", help="list targets and exit")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiling.start(args)
+    if args.png_profile:
+        set_profile(args.png_profile)
+    if args.android_format:
+        set_android_format(args.android_format)
+    if args.png_palette:
+        set_palette(True)
+
+    try:
+        targets = load_spec(args.spec)
+        for name, overrides in (params or {}).items():
+            targets[name]["params"] = dict(targets[name].get("params", {}), **overrides)
+        order = plan(targets, args.targets)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    if args.list:
+        for name, target in targets.items():
+            deps = f" (after {', '.join(target['deps'])})" if target["deps"] else ""
+            optional = " (optional)" if target.get("optional") else ""
+            print(f"{name:28} {len(target['outputs']):3} outputs{deps}{optional}")
+        return 0
+
+    print(f"Building {len(order)} target(s): {', '.join(order)}")
+    manifest = AssetManifest(force=args.force or None)
+    try:
+        memory_limit = args.max_memory * 1024 * 1024 if args.max_memory else None
+        run(targets, order, manifest, args.jobs, memory_limit)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        manifest.save()
+
+    print("\n✅ Build complete")
+    writer.print_summary()
+    profiling.finish(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Builders for the targets declared in asset_spec.json.
+
+Each builder takes a target (the spec entry plus its name) and the shared
+asset manifest, writes the target's outputs and returns its log lines.
+Outputs that map to the same spec value (e.g. two paths at 192 px) are
+rendered and encoded once, and outputs whose inputs are unchanged are
+skipped.
+"""
+
+import os
+
+from PIL import Image, ImageColor
+
+from pebble_assets import profiling
+from pebble_assets.ico import ico_sizes, save_ico
+from pebble_assets.outputs import save_copies
+from pebble_assets.pyramid import DEFAULT_REDUCING_GAP, decode_size_for, source_pyramid
+from pebble_assets.source_cache import estimate_decode_bytes, load_source
+from pebble_assets.writer import write_text
+
+BUILDERS = {}
+
+
+def builder(name):
+    """Register a builder function under the name used in the spec"""
+    def register(func):
+        BUILDERS[name] = func
+        return func
+    return register
+
+
+def _value_key(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _render_groups(target, manifest, render, generators):
+    """
+    Render each distinct output value once and copy it to all its paths.
+
+    `render(value)` returns the image for one spec value (a size, a
+    [width, height] pair, ...).
+    """
+    params = target.get('params', {})
+    groups = {}
+    for output_path, value in target['outputs'].items():
+        groups.setdefault(_value_key(value), []).append(output_path)
+
+    log = []
+    for value, output_paths in groups.items():
+        key = manifest.input_key(*generators, sources=target.get('inputs', []),
+                                 value=value, params=params)
+        if all(manifest.is_fresh(path, key) for path in output_paths):
+            log += [f"Up to date: {path}" for path in output_paths]
+            continue
+        with profiling.target(output_paths[0]):
+            save_copies(render(value), output_paths, 'PNG')
+        for path in output_paths:
+            manifest.record(path, key)
+            log.append(f"Created: {path}")
+    return log
+
+
+def _output_sizes(target):
+    return [(value, value) if isinstance(value, int) else tuple(value)
+            for value in target['outputs'].values()]
+
+
+def _largest_output(target):
+    return max(_output_sizes(target), key=lambda size: size[0] * size[1])
+
+
+def estimate_peak_bytes(target):
+    """
+    Rough peak memory of building `target`: its inputs decoded at the size
+    it needs plus a few copies of its largest output canvas (render,
+    flatten, encode).
+    """
+    largest = _largest_output(target)
+    min_size = decode_size_for(largest, DEFAULT_REDUCING_GAP)
+    inputs = sum(estimate_decode_bytes(path, min_size=min_size)
+                 for path in target.get('inputs', []) if os.path.exists(path))
+    return inputs + 3 * largest[0] * largest[1] * 4
+
+
+def _flatten(image, background):
+    """Composite an RGBA image onto a solid background, returning RGB"""
+    flat = Image.new('RGB', image.size, ImageColor.getrgb(background)[:3])
+    flat.paste(image, mask=image.getchannel('A'))
+    return flat
+
+
+@builder('resize')
+def build_resize(target, manifest):
+    """
+    Square resizes of one source image, optionally flattened on a color and
+    then run through the pipeline presets named in params.fix
+    """
+    from pebble_assets.pipeline import PRESETS, Pipeline
+
+    params = target.get('params', {})
+    source_path = target['inputs'][0]
+    background = params.get('background')
+    unknown = [name for name in params.get('fix', []) if name not in PRESETS]
+    if unknown:
+        raise ValueError(f"Target '{target['name']}': unknown fix preset(s) {', '.join(unknown)}")
+    fixes = Pipeline(*[step for name in params.get('fix', []) for step in PRESETS[name]])
+
+    largest = _largest_output(target)
+
+    def render(size):
+        resized = source_pyramid(source_path, max_output=largest).resize(size)
+        return fixes.apply(_flatten(resized, background) if background else resized)
+
+    return _render_groups(target, manifest, render, [build_resize])
+
+
+@builder('ico')
+def build_ico(target, manifest):
+    """
+    Multi-resolution .ico files. The spec value is the largest entry; the
+    standard sizes up to it are taken from the source's shared pyramid, so
+    frames other icon targets already resized are reused, not resampled.
+    """
+    source_path = target['inputs'][0]
+    pyramid = source_pyramid(source_path, max_output=_largest_output(target))
+
+    log = []
+    for output_path, largest in target['outputs'].items():
+        key = manifest.input_key(build_ico, sources=[source_path], value=largest)
+        if manifest.is_fresh(output_path, key):
+            log.append(f"Up to date: {output_path}")
+            continue
+        with profiling.target(output_path):
+            save_ico({size: pyramid.resize(size) for size in ico_sizes(largest)}, output_path)
+        manifest.record(output_path, key)
+        log.append(f"Created: {output_path} ({', '.join(map(str, ico_sizes(largest)))} px)")
+    return log
+
+
+@builder('fit')
+def build_fit(target, manifest):
+    """Source scaled to fit each [width, height] canvas on a solid background"""
+    from generate_splash_from_image import fit_on_canvas
+
+    source_path = target['inputs'][0]
+    background = ImageColor.getrgb(target.get('params', {}).get('background', '#FF9500'))
+    min_size = decode_size_for(_largest_output(target))
+
+    def render(size):
+        width, height = size
+        return fit_on_canvas(load_source(source_path, min_size=min_size), width, height, background)
+
+    return _render_groups(target, manifest, render, [build_fit])
+
+
+@builder('splash')
+def build_splash(target, manifest):
+    """
+    Branded splash (P logo, app name and tagline) from create_splash_images
+    at each [width, height]; params.layout gives every output its
+    [logo size, title font size, tagline font size].
+    """
+    from create_splash_images import FONTS, render_splash_image, solve_layout
+    from pebble_assets.fonts import resolve
+
+    source_path = target['inputs'][0]
+    layouts = target['params']['layout']
+    fonts = [resolve(family) for family in FONTS.values()]
+    log = []
+    for output_path, size in target['outputs'].items():
+        layout = layouts[output_path]
+        key = manifest.input_key(build_splash, sources=[source_path, *fonts],
+                                 value=_value_key(size), layout=layout)
+        if manifest.is_fresh(output_path, key):
+            log.append(f"Up to date: {output_path}")
+            continue
+        with profiling.target(output_path):
+            image = render_splash_image(solve_layout(*size, *layout), source_path)
+            save_copies(image, [output_path], 'PNG')
+        manifest.record(output_path, key)
+        log.append(f"Created: {output_path} ({size[0]}x{size[1]})")
+    return log
+
+
+@builder('solid')
+def build_solid(target, manifest):
+    """Solid-color squares (e.g. the orange Android 12 splash foreground)"""
+    color = ImageColor.getrgb(target['params']['color'])
+    if len(color) == 3:
+        color += (255,)
+
+    def render(size):
+        return Image.new('RGBA', (size, size), color)
+
+    return _render_groups(target, manifest, render, [build_solid])
+
+
+@builder('feature_graphic')
+def build_feature_graphic(target, manifest):
+    """Play Store feature graphic from generate_playstore_from_icon"""
+    from generate_playstore_from_icon import feature_graphic_sources, render_feature_graphic
+
+    source_path = target['inputs'][0]
+    log = []
+    for output_path, size in target['outputs'].items():
+        key = manifest.input_key(build_feature_graphic, render_feature_graphic,
+                                 sources=feature_graphic_sources(source_path), value=_value_key(size))
+        if manifest.is_fresh(output_path, key):
+            log.append(f"Up to date: {output_path}")
+            continue
+        # Logged with the rest of the target, not printed from the worker thread
+        log += render_feature_graphic(source_path, output_path)
+        manifest.record(output_path, key)
+        log.append(f"Created: {output_path}")
+    return log
+
+
+@builder('vector')
+def build_vector(target, manifest):
+    """
+    The procedural PebbleNote icon as vector art: Android VectorDrawable for
+    `.xml` outputs, SVG for `.svg`. The spec value is the viewport size; the
+    optional params are `background` (draw the rounded orange square,
+    default true) and `scale` (about the center, e.g. 66/108 for an adaptive
+    icon's safe zone).
+    """
+    from generate_playstore_assets import pebblenote_shapes
+    from pebble_assets.vector import svg, vector_drawable
+
+    params = target.get('params', {})
+    log = []
+    for output_path, size in target['outputs'].items():
+        key = manifest.input_key(build_vector, value=size, params=params)
+        if manifest.is_fresh(output_path, key):
+            log.append(f"Up to date: {output_path}")
+            continue
+        shapes = pebblenote_shapes(size, params.get('background', True))
+        if output_path.endswith('.xml'):
+            text = vector_drawable(shapes, size, scale=params.get('scale', 1.0))
+        else:
+            text = svg(shapes, size)
+        write_text(output_path, text)
+        manifest.record(output_path, key)
+        log.append(f"Created: {output_path}")
+    return log
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Asset bundle analyzer for the Flutter app.
+
+Flutter ships every file matched by the `flutter: assets:` entries in
+pubspec.yaml (a directory entry means every file directly inside it). This
+tool works out which of those files the app can actually load:
+
+  runtime     string literals 'assets/...' in lib/**/*.dart, plus any
+              resolution variants (assets/icon/2.0x/foo.png) Flutter
+              picks up next to them
+  build-time  paths named in the flutter_launcher_icons / flutter_native_splash
+              config; those tools read them at build time, so they need to
+              stay in the repo but not in the bundle
+
+and reports the bytes the rest costs, exact duplicates among them and a
+per-file `assets:` list. With --write that list replaces the one in
+pubspec.yaml; no asset files are deleted.
+
+Usage (from the repo root):
+    python -m pebble_assets.bundle
+    python -m pebble_assets.bundle --write
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import re
+import sys
+from collections import defaultdict
+
+PUBSPEC_PATH = "pubspec.yaml"
+DART_GLOB = "lib/**/*.dart"
+CONFIG_SECTIONS = ("flutter_launcher_icons", "flutter_native_splash")
+
+_ASSET_LITERAL = re.compile(r"""(['"])(assets/[^'"\n]+)\1""")
+_CONFIG_VALUE = re.compile(r"""(?:^|[\s:'"])(assets/[^'"\s#]+)""")
+_VARIANT_DIR = re.compile(r"^\d+(\.\d+)?x$")
+_NEEDS_QUOTES = re.compile(r"""^[\s'"&*!|>%@`#\[\]{},?-]|: | #|\s$""")
+
+
+def _read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines(keepends=True)
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip(" "))
+
+
+def _section(lines, name):
+    """(start, end) line indices of the top-level YAML block `name:`"""
+    for i, line in enumerate(lines):
+        if line.rstrip() == f"{name}:" or line.startswith(f"{name}: "):
+            end = i + 1
+            while end < len(lines) and (not lines[end].strip() or _indent(lines[end]) > 0
+                                        or lines[end].lstrip().startswith("#")):
+                end += 1
+            return i, end
+    return None
+
+
+def _assets_block(lines):
+    """(start, end, entries) of the `assets:` list inside the `flutter:` block"""
+    section = _section(lines, "flutter")
+    if not section:
+        return None
+    for i in range(*section):
+        if lines[i].strip() == "assets:":
+            end = i + 1
+            entries = []
+            while end < section[1]:
+                item = lines[end].strip()
+                if item.startswith("- "):
+                    entries.append(item[2:].split(" #")[0].strip().strip("'\""))
+                elif item and not item.startswith("#"):
+                    break
+                end += 1
+            # Leave trailing blank lines and comments to the next key
+            while end > i + 1 and not lines[end - 1].strip().startswith("- "):
+                end -= 1
+            return i, end, entries
+    return None
+
+
+def declared_files(entries):
+    """Every file the `assets:` entries put in the bundle"""
+    files = set()
+    for entry in entries:
+        if entry.endswith("/"):
+            # Directory entries are not recursive
+            if os.path.isdir(entry):
+                files.update(
+                    f"{entry}{name}" for name in os.listdir(entry)
+                    if os.path.isfile(os.path.join(entry, name)))
+        elif os.path.isfile(entry):
+            files.add(entry)
+    return files
+
+
+def runtime_references(dart_glob=DART_GLOB):
+    """{asset path: ['file:line', ...]} for every asset string literal in the Dart sources"""
+    refs = defaultdict(list)
+    for path in sorted(glob.glob(dart_glob, recursive=True)):
+        for number, line in enumerate(_read_lines(path), 1):
+            for match in _ASSET_LITERAL.finditer(line):
+                refs[match.group(2)].append(f"{path.replace(os.sep, '/')}:{number}")
+    return dict(refs)
+
+
+def config_references(lines):
+    """{asset path: [config section]} named by the launcher-icon and splash tools"""
+    refs = defaultdict(list)
+    for name in CONFIG_SECTIONS:
+        section = _section(lines, name)
+        if not section:
+            continue
+        for line in lines[section[0]:section[1]]:
+            for match in _CONFIG_VALUE.finditer(line.split(" #")[0]):
+                if name not in refs[match.group(1)]:
+                    refs[match.group(1)].append(name)
+    return dict(refs)
+
+
+def _matches(reference, files):
+    """Files a runtime reference can load, including interpolated paths and resolution variants"""
+    if "$" in reference:
+        # 'assets/icon/$name.png' - keep everything it could expand to
+        pattern = re.compile(
+            "^" + ".+".join(re.escape(part) for part in
+                            re.split(r"\$\{[^}]*\}|\$\w+", reference)) + "$")
+        return {path for path in files if pattern.match(path)}
+    folder, name = os.path.split(reference)
+    matched = {reference} if reference in files else set()
+    for path in files:
+        variant_folder, variant_name = os.path.split(path)
+        if (variant_name == name and os.path.dirname(variant_folder) == folder
+                and _VARIANT_DIR.match(os.path.basename(variant_folder))):
+            matched.add(path)
+    return matched
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def duplicate_groups(paths):
+    """Groups (2+) of byte-identical files among `paths`, largest first"""
+    by_size = defaultdict(list)
+    for path in paths:
+        by_size[os.path.getsize(path)].append(path)
+    groups = defaultdict(list)
+    for size, same_size in by_size.items():
+        if len(same_size) > 1:
+            for path in same_size:
+                groups[(size, _sha256(path))].append(path)
+    return [sorted(group) for key, group in sorted(groups.items(), reverse=True)
+            if len(group) > 1]
+
+
+def analyze(pubspec_path=PUBSPEC_PATH, dart_glob=DART_GLOB):
+    lines = _read_lines(pubspec_path)
+    block = _assets_block(lines)
+    entries = block[2] if block else []
+    declared = declared_files(entries)
+
+    runtime = runtime_references(dart_glob)
+    keep = set()
+    for reference in runtime:
+        keep |= _matches(reference, declared)
+    missing = sorted(ref for ref in runtime if "$" not in ref and ref not in declared)
+
+    return {
+        "entries": entries,
+        "declared": declared,
+        "runtime": runtime,
+        "config": config_references(lines),
+        "keep": keep,
+        "missing": missing,
+    }
+
+
+def _yaml_scalar(path):
+    # File names like "a: b.png" or "#1.png" need quoting to stay one string
+    return f'"{path}"' if _NEEDS_QUOTES.search(path) else path
+
+
+def assets_yaml(paths, indent="  "):
+    """A per-file `assets:` block for pubspec.yaml"""
+    lines = [f"{indent}assets:\n"]
+    lines += [f"{indent}  - {_yaml_scalar(path)}\n" for path in sorted(paths)]
+    return "".join(lines)
+
+
+def write_assets(pubspec_path, paths):
+    """Replace the `flutter: assets:` list in pubspec.yaml with one entry per file"""
+    lines = _read_lines(pubspec_path)
+    block = _assets_block(lines)
+    if not block:
+        raise ValueError(f"No flutter: assets: list in {pubspec_path}")
+    start, end, _ = block
+    indent = lines[start][:_indent(lines[start])]
+    lines[start:end] = [assets_yaml(paths, indent)]
+    tmp_path = pubspec_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    os.replace(tmp_path, pubspec_path)
+
+
+def _size(num_bytes):
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024 or unit == "MB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def report(result, verbose=False):
+    declared = result["declared"]
+    keep = result["keep"]
+    unused = sorted(declared - keep, key=os.path.getsize, reverse=True)
+    total = sum(os.path.getsize(path) for path in declared)
+    kept = sum(os.path.getsize(path) for path in keep)
+
+    print(f"📦 Declared: {', '.join(result['entries']) or '(nothing)'}"
+          f" -> {len(declared)} files, {_size(total)}")
+
+    print(f"\nRuntime references (lib/): {len(result['runtime'])}")
+    for reference, places in sorted(result["runtime"].items()):
+        size = _size(os.path.getsize(reference)) if os.path.isfile(reference) else "missing"
+        print(f"  {reference:40} {size:>9}  {', '.join(places)}")
+
+    if result["config"]:
+        print("\nBuild-time only (read by the tools, not needed in the bundle):")
+        for reference, sections in sorted(result["config"].items()):
+            print(f"  {reference:40} {', '.join(sections)}")
+
+    print(f"\nUnreferenced: {len(unused)} files, {_size(total - kept)}")
+    for path in unused if verbose else unused[:10]:
+        print(f"  {_size(os.path.getsize(path)):>9}  {path}")
+    if not verbose and len(unused) > 10:
+        print(f"  ... {len(unused) - 10} more (--verbose lists all)")
+
+    duplicates = duplicate_groups(declared)
+    if duplicates:
+        wasted = sum(os.path.getsize(group[0]) * (len(group) - 1) for group in duplicates)
+        print(f"\nExact duplicates: {len(duplicates)} groups, {_size(wasted)} redundant")
+        for group in duplicates:
+            print(f"  {_size(os.path.getsize(group[0])):>9}  {' = '.join(group)}")
+
+    for reference in result["missing"]:
+        print(f"\n⚠️ {reference} is used in lib/ but not declared in pubspec.yaml")
+
+    saved = total - kept
+    percent = f" ({saved / total:.0%})" if total else ""
+    print(f"\n💾 Minimal bundle: {len(keep)} files, {_size(kept)} - saves {_size(saved)}{percent}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Find the assets the app actually loads and trim the pubspec assets list")
+    parser.add_argument("--pubspec", default=PUBSPEC_PATH,
+                        help=f"pubspec file (default: {PUBSPEC_PATH})")
+    parser.add_argument("--emit", action="store_true",
+                        help="print the per-file assets: list for pubspec.yaml")
+    parser.add_argument("--write", action="store_true",
+                        help="replace the assets: list in the pubspec with the per-file list")
+    parser.add_argument("--verbose", action="store_true", help="list every unreferenced file")
+    args = parser.parse_args(argv)
+
+    result = analyze(args.pubspec)
+    report(result, args.verbose)
+    keep = result["keep"]
+
+    if args.emit:
+        print("\n" + assets_yaml(keep), end="")
+    if args.write:
+        if not result["runtime"]:
+            print("❌ No asset references found in lib/, leaving the pubspec untouched")
+            return 1
+        write_assets(args.pubspec, keep)
+        print(f"✅ Wrote {len(keep)} asset entries to {args.pubspec}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
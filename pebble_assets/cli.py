@@ -0,0 +1,256 @@
+"""
+pebble-assets: one entry point for the asset generators.
+
+    pebble-assets icons       Android launcher/foreground, iOS, web and Windows icons
+    pebble-assets splash      Android splash images and splash foreground
+    pebble-assets playstore   Play Store icons and feature graphic
+    pebble-assets fix         in-place fix_* presets on the mipmap icons
+    pebble-assets all         every target in asset_spec.json
+    pebble-assets watch       rebuild targets as their sources change
+    pebble-assets bundle      report (and trim) the assets shipped in the app
+    pebble-assets dupes       duplicate / near-duplicate images under assets/
+    pebble-assets golden      compare generator outputs with the golden images
+
+Only argparse, json, the PNG profile table, the fix preset table and the
+profiler are imported up front; Pillow and the builders are imported by the
+subcommand that needs them, so --help and --list return without loading any
+imaging code. Run it as ./pebble-assets or `python -m pebble_assets` from
+anywhere in the repo.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from pebble_assets import profiling
+from pebble_assets.pipeline import PRESETS
+from pebble_assets.encoder import ANDROID_FORMAT_ENV, ANDROID_FORMATS, DEFAULT_PROFILE, PROFILE_ENV, PROFILES
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPEC_PATH = "asset_spec.json"
+
+# Subcommand -> asset_spec.json targets it builds (None: all of them)
+GROUPS = {
+    "icons": ["android-icons", "android-foreground", "android-icon-vector", "ios-icons", "web-icons",
+              "windows-icon", "icon-svg"],
+    "splash": ["android-splash", "android-splash-foreground"],
+    "playstore": ["playstore-icons", "feature-graphic"],
+    "all": None,
+}
+DEFAULT_FIXES = ["whitespace", "transparent"]
+FIX_PRESETS = sorted(PRESETS)
+
+
+def _spec_targets(spec_path):
+    """{name: target} straight from the spec JSON, without importing the builders"""
+    with open(spec_path, encoding="utf-8") as f:
+        return json.load(f)["targets"]
+
+
+def _list_targets(command, spec_path):
+    targets = _spec_targets(spec_path)
+    for name in GROUPS[command] or targets:
+        target = targets.get(name)
+        if target is None:
+            print(f"{name:28} (missing from {spec_path})")
+            continue
+        print(f"{name:28} {len(target['outputs']):3} outputs  [{target['builder']}]")
+    return 0
+
+
+def _profile_argv(args):
+    if not args.profile:
+        return []
+    return ["--profile", args.profile, "--profile-top", str(args.profile_top)]
+
+
+def _build(args):
+    if args.list:
+        return _list_targets(args.command, args.spec)
+
+    from pebble_assets import build
+
+    argv = list(GROUPS[args.command] or []) + ["--spec", args.spec, "--jobs", str(args.jobs)]
+    if args.force:
+        argv.append("--force")
+    if args.png_profile:
+        argv += ["--png-profile", args.png_profile]
+    if args.android_format:
+        argv += ["--android-format", args.android_format]
+    if args.png_palette:
+        argv.append("--png-palette")
+    if args.max_memory:
+        argv += ["--max-memory", str(args.max_memory)]
+    return build.main(argv + _profile_argv(args))
+
+
+def _watch(args):
+    from pebble_assets import watch
+
+    argv = list(args.targets) + ["--spec", args.spec, "--jobs", str(args.jobs)]
+    for flag in ("interval", "debounce", "png_profile", "android_format"):
+        value = getattr(args, flag)
+        if value is not None:
+            argv += ["--" + flag.replace("_", "-"), str(value)]
+    if args.png_palette:
+        argv.append("--png-palette")
+    return watch.main(argv)
+
+
+def _fix_preset(name):
+    # argparse rejects an empty nargs="*" positional that has choices=, so
+    # the names are checked here instead, still at parse time
+    if name not in FIX_PRESETS:
+        raise argparse.ArgumentTypeError(
+            f"invalid choice: {name!r} (choose from {', '.join(map(repr, FIX_PRESETS))})")
+    return name
+
+
+def _fix(args):
+    presets = args.presets or DEFAULT_FIXES
+    if args.list:
+        print("Presets: " + ", ".join(FIX_PRESETS))
+        print("Default chain: " + " -> ".join(DEFAULT_FIXES))
+        return 0
+
+    from pebble_assets import pipeline
+
+    argv = list(presets)
+    for folder in args.folders or []:
+        argv += ["--folder", folder]
+    return pipeline.main(argv + _profile_argv(args))
+
+
+def _bundle(args):
+    from pebble_assets import bundle
+
+    argv = [flag for flag, on in [("--emit", args.emit), ("--write", args.write),
+                                  ("--verbose", args.verbose)] if on]
+    return bundle.main(argv)
+
+
+def _dupes(args):
+    from pebble_assets import image_index
+
+    argv = list(args.paths)
+    if args.threshold is not None:
+        argv += ["--threshold", str(args.threshold)]
+    return image_index.main(argv)
+
+
+def _golden(args):
+    from pebble_assets import golden
+
+    return golden.main(list(args.generators) + (["--update"] if args.update else []))
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(
+        prog="pebble-assets", description="Generate the PebbleNote app assets")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+
+    for name, help_text in [
+        ("icons", "Android launcher/foreground, iOS, web and Windows icons"),
+        ("splash", "Android splash images and splash foreground"),
+        ("playstore", "Play Store icons and feature graphic"),
+        ("all", "every target in the asset spec"),
+    ]:
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument("--spec",
+                             help=f"spec file (default: {SPEC_PATH} in the repo root)")
+        command.add_argument("-j", "--jobs", type=int, default=0,
+                             help="concurrent targets (default: all cores)")
+        command.add_argument("--force", action="store_true",
+                             help="rebuild every output, ignoring the asset manifest")
+        command.add_argument("--png-profile", choices=sorted(PROFILES),
+                             help=f"PNG encoder profile (default: ${PROFILE_ENV} or {DEFAULT_PROFILE})")
+        command.add_argument("--android-format", choices=ANDROID_FORMATS,
+                             help=f"format of Android drawable/mipmap outputs "
+                                  f"(default: ${ANDROID_FORMAT_ENV} or png)")
+        command.add_argument("--png-palette", action="store_true",
+                             help="store low-colour PNGs as 8-bit palette images")
+        command.add_argument("--max-memory", type=int, metavar="MB",
+                             help="estimated peak memory ceiling for concurrent targets "
+                                  "(default: $PEBBLE_MAX_MEMORY_MB or unlimited)")
+        command.add_argument("--list", action="store_true", help="list targets and exit")
+        profiling.add_arguments(command)
+        command.set_defaults(func=_build)
+
+    watch = commands.add_parser("watch", help="rebuild targets whenever their sources change",
+                                description="Keep generated assets up to date while sources are edited")
+    watch.add_argument("targets", nargs="*", help="targets to keep up to date (default: all)")
+    watch.add_argument("--spec", help=f"spec file (default: {SPEC_PATH} in the repo root)")
+    watch.add_argument("-j", "--jobs", type=int, default=0,
+                       help="concurrent targets (default: all cores)")
+    watch.add_argument("--interval", type=float, help="seconds between polls (default: 0.2)")
+    watch.add_argument("--debounce", type=float,
+                       help="quiet seconds after a change before rebuilding (default: 0.3)")
+    watch.add_argument("--png-profile", choices=sorted(PROFILES),
+                       help=f"PNG encoder profile (default: ${PROFILE_ENV} or {DEFAULT_PROFILE})")
+    watch.add_argument("--android-format", choices=ANDROID_FORMATS,
+                       help=f"format of Android drawable/mipmap outputs "
+                            f"(default: ${ANDROID_FORMAT_ENV} or png)")
+    watch.add_argument("--png-palette", action="store_true",
+                       help="store low-colour PNGs as 8-bit palette images")
+    watch.set_defaults(func=_watch)
+
+    fix = commands.add_parser("fix", help="apply fix_* presets to the mipmap icons in place",
+                              description="Apply chained presets with one write per icon")
+    fix.add_argument("presets", nargs="*", metavar="preset", type=_fix_preset,
+                     help=f"presets to chain, from {', '.join(FIX_PRESETS)} "
+                          f"(default: {' '.join(DEFAULT_FIXES)})")
+    fix.add_argument("--folder", action="append", dest="folders",
+                     help="folder to process (repeatable; default: the mipmap folders)")
+    fix.add_argument("--list", action="store_true", help="list presets and exit")
+    profiling.add_arguments(fix)
+    fix.set_defaults(func=_fix)
+
+    bundle = commands.add_parser("bundle", help="find the assets the app loads and trim pubspec.yaml",
+                                 description="Report unreferenced bundled assets")
+    bundle.add_argument("--emit", action="store_true", help="print the per-file assets: list")
+    bundle.add_argument("--write", action="store_true",
+                        help="replace the assets: list in pubspec.yaml with the per-file list")
+    bundle.add_argument("--verbose", action="store_true", help="list every unreferenced file")
+    bundle.set_defaults(func=_bundle)
+
+    dupes = commands.add_parser("dupes", help="find duplicate and near-duplicate images",
+                                description="Look up images in the perceptual-hash index")
+    dupes.add_argument("paths", nargs="*", help="images to look up (default: list all groups)")
+    dupes.add_argument("--threshold", type=int,
+                       help="max differing hash bits for a near duplicate")
+    dupes.set_defaults(func=_dupes)
+
+    golden = commands.add_parser("golden", help="compare generator outputs with the golden images",
+                                 description="Render every generator on fixtures and diff against golden/")
+    golden.add_argument("generators", nargs="*", help="generators to check (default: all)")
+    golden.add_argument("--update", action="store_true",
+                        help="overwrite the golden images with the current renders")
+    golden.set_defaults(func=_golden)
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    # Paths given on the command line are relative to the caller's directory,
+    # everything else (spec, generator outputs) to the repo root
+    if getattr(args, "spec", None):
+        args.spec = os.path.abspath(args.spec)
+    elif hasattr(args, "spec"):
+        args.spec = SPEC_PATH
+    if getattr(args, "paths", None):
+        args.paths = [os.path.relpath(os.path.abspath(path), REPO_ROOT) for path in args.paths]
+    if getattr(args, "profile", None) and args.profile != profiling.DEFAULT_TRACE:
+        args.profile = os.path.abspath(args.profile)
+    if getattr(args, "folders", None):
+        args.folders = [os.path.abspath(folder) for folder in args.folders]
+    os.chdir(REPO_ROOT)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
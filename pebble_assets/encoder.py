@@ -0,0 +1,176 @@
+"""
+Central PNG encoder settings.
+
+Every generator saves through `save_png` / `encode_png`, so the zlib effort
+is chosen in one place by a named profile:
+
+    dev       fastest zlib level, no optimize pass - for design iteration
+    balanced  zlib's default level (the default profile)
+    release   Pillow's optimize pass at maximum compression - smallest files
+
+The profile is picked with set_profile() (e.g. from a --png-profile flag) or
+the PEBBLE_PNG_PROFILE environment variable.
+
+Android drawable/mipmap outputs can instead be written as lossless WebP
+(supported from API 18, below our minSdk 21) with set_android_format('webp')
+or PEBBLE_ANDROID_FORMAT=webp. Generators keep asking for `.png` paths;
+`output_path` maps them to `.webp`, and the stale sibling in the other
+format is removed so Android never sees two resources with one name.
+
+Palette mode (set_palette(True) or PEBBLE_PNG_PALETTE=1) stores low-colour
+PNGs as 8-bit palette images when that stays within a small per-pixel
+error (see pebble_assets.palette); everything else stays truecolor.
+
+Files are only rewritten when their bytes change (see pebble_assets.writer).
+"""
+
+import io
+import os
+import re
+
+from pebble_assets import profiling
+from pebble_assets.writer import write_bytes
+
+PROFILES = {
+    'dev': {'compress_level': 1},
+    'balanced': {'compress_level': 6},
+    'release': {'optimize': True},  # implies compress_level 9
+}
+DEFAULT_PROFILE = 'balanced'
+PROFILE_ENV = 'PEBBLE_PNG_PROFILE'
+
+# Lossless WebP effort per profile (`quality` is compression effort when lossless)
+WEBP_PROFILES = {
+    'dev': {'lossless': True, 'method': 0, 'quality': 0},
+    'balanced': {'lossless': True, 'method': 4, 'quality': 80},
+    'release': {'lossless': True, 'method': 6, 'quality': 100},
+}
+ANDROID_FORMATS = ('png', 'webp')
+ANDROID_FORMAT_ENV = 'PEBBLE_ANDROID_FORMAT'
+PALETTE_ENV = 'PEBBLE_PNG_PALETTE'
+_ANDROID_RES = re.compile(r'(^|/)android/app/src/main/res/(drawable|mipmap)[^/]*/[^/]+\.(png|webp)$')
+
+_profile = None
+_android_format = None
+_palette = None
+
+
+def set_profile(name):
+    """Select the PNG profile for the rest of this run"""
+    global _profile
+    if name not in PROFILES:
+        raise ValueError(f"Unknown PNG profile '{name}' (choose from {', '.join(PROFILES)})")
+    _profile = name
+    # Inherited by worker processes and child scripts
+    os.environ[PROFILE_ENV] = name
+
+
+def current_profile():
+    name = _profile or os.environ.get(PROFILE_ENV) or DEFAULT_PROFILE
+    if name not in PROFILES:
+        raise ValueError(f"Unknown PNG profile '{name}' (choose from {', '.join(PROFILES)})")
+    return name
+
+
+def png_params(profile=None):
+    """Pillow save() keyword arguments for a PNG profile"""
+    return dict(PROFILES[profile or current_profile()])
+
+
+def set_palette(enabled):
+    """Turn palette quantization of PNG outputs on or off for the rest of this run"""
+    global _palette
+    _palette = bool(enabled)
+    os.environ[PALETTE_ENV] = '1' if enabled else '0'
+
+
+def palette_enabled():
+    if _palette is not None:
+        return _palette
+    return os.environ.get(PALETTE_ENV) == '1'
+
+
+def prepare_png(image):
+    """`image` as it should be PNG-encoded: palettized in palette mode when within tolerance"""
+    if not palette_enabled():
+        return image
+    from pebble_assets.palette import palettize
+    with profiling.stage("palettize"):
+        return palettize(image) or image
+
+
+def set_android_format(name):
+    """Select 'png' or 'webp' for Android drawable/mipmap outputs"""
+    global _android_format
+    if name not in ANDROID_FORMATS:
+        raise ValueError(f"Unknown Android format '{name}' (choose from {', '.join(ANDROID_FORMATS)})")
+    _android_format = name
+    os.environ[ANDROID_FORMAT_ENV] = name
+
+
+def android_format():
+    name = _android_format or os.environ.get(ANDROID_FORMAT_ENV) or 'png'
+    if name not in ANDROID_FORMATS:
+        raise ValueError(f"Unknown Android format '{name}' (choose from {', '.join(ANDROID_FORMATS)})")
+    return name
+
+
+def is_android_resource(path):
+    return bool(_ANDROID_RES.search(path.replace(os.sep, '/')))
+
+
+def output_path(path):
+    """Where a generator's `.png` output really goes (`.webp` for Android resources in WebP mode)"""
+    if is_android_resource(path):
+        return os.path.splitext(path)[0] + '.' + android_format()
+    return path
+
+
+def save_params(path, profile=None):
+    """(format, Pillow save() arguments) for writing `path`, chosen by its extension"""
+    if path.lower().endswith('.webp'):
+        return 'WEBP', dict(WEBP_PROFILES[profile or current_profile()])
+    return 'PNG', png_params(profile)
+
+
+def remove_stale_sibling(path):
+    """
+    Delete the other-format twin of an Android resource about to be written
+    at `path`, returning its size (None when there was none).
+    """
+    if not is_android_resource(path):
+        return None
+    stem, ext = os.path.splitext(path)
+    sibling = stem + ('.png' if ext.lower() == '.webp' else '.webp')
+    if not os.path.exists(sibling):
+        return None
+    size = os.path.getsize(sibling)
+    os.remove(sibling)
+    return size
+
+
+def report_saving(path, old_size):
+    """Print the size change of a resource that replaced a sibling of `old_size` bytes"""
+    if old_size is None:
+        return
+    new_size = os.path.getsize(path)
+    change = (new_size - old_size) / old_size if old_size else 0.0
+    print(f"🗜️ {path}: {old_size / 1024:.1f} KB -> {new_size / 1024:.1f} KB ({change:+.0%})")
+
+
+def save_png(image, path, profile=None):
+    """
+    Save `image` using the active (or given) profile. The name is historical:
+    Android resources go to WebP in WebP mode, and `.webp` paths always do.
+    """
+    path = output_path(path)
+    format, params = save_params(path, profile)
+    if format == 'PNG':
+        image = prepare_png(image)
+    with profiling.stage("encode"):
+        buffer = io.BytesIO()
+        image.save(buffer, format, **params)
+    old_size = remove_stale_sibling(path)
+    write_bytes(path, buffer.getvalue())
+    report_saving(path, old_size)
+    return path
@@ -0,0 +1,113 @@
+"""
+Font registry shared by the generator scripts.
+
+Fonts are looked up by family name rather than by hard-coded
+C:\\Windows\\Fonts paths. Each family lists candidate file names, which are
+searched in the bundled font directory (fonts_cache/, committed with the
+repo) first and then in the usual system font folders. Every family is
+bundled (Anton, and DejaVu Sans and Serif - see fonts_cache/LICENSE_DEJAVU),
+so generated text looks the same on Windows, macOS and Linux. Opened
+FreeTypeFont objects are cached per (path, size), so rendering six splash
+densities parses each TTF once per size instead of once per call.
+
+Nothing here touches the network. If a family cannot be found, Pillow's
+built-in font is used at the requested size. Set PEBBLE_FONTS_BUNDLED_ONLY=1
+to ignore system fonts entirely, which makes text rendering identical on
+every machine with the same Pillow version.
+"""
+
+import functools
+import os
+import sys
+
+from PIL import ImageFont
+
+from pebble_assets import profiling
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FONTS_DIR = os.path.join(REPO_ROOT, "fonts_cache")
+BUNDLED_ONLY_ENV = "PEBBLE_FONTS_BUNDLED_ONLY"
+
+# Family -> candidate font files, most preferred first
+FAMILIES = {
+    "anton": ["Anton-Regular.ttf"],
+    "sans": ["DejaVuSans.ttf", "segoeui.ttf", "arial.ttf", "Helvetica.ttc"],
+    "sans-bold": ["DejaVuSans-Bold.ttf", "segoeuib.ttf", "arialbd.ttf", "Arial Bold.ttf",
+                  "Helvetica.ttc"],
+    "sans-italic": ["DejaVuSans-Oblique.ttf", "segoeuii.ttf", "ariali.ttf", "Arial Italic.ttf",
+                    "Helvetica.ttc"],
+    "serif": ["DejaVuSerif.ttf", "georgia.ttf", "times.ttf", "palatino.ttf", "Georgia.ttf"],
+}
+
+
+def _system_font_dirs():
+    if sys.platform == "win32":
+        return [os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts")]
+    if sys.platform == "darwin":
+        return ["/System/Library/Fonts", "/Library/Fonts",
+                os.path.expanduser("~/Library/Fonts")]
+    return ["/usr/share/fonts", "/usr/local/share/fonts", os.path.expanduser("~/.fonts")]
+
+
+def _index_dir(directory):
+    """Lower-cased file name -> path for every font file under `directory`"""
+    index = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            if name.lower().endswith((".ttf", ".ttc", ".otf")):
+                index.setdefault(name.lower(), os.path.join(root, name))
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def _bundled_index():
+    return _index_dir(FONTS_DIR)
+
+
+@functools.lru_cache(maxsize=None)
+def _system_index():
+    if os.environ.get(BUNDLED_ONLY_ENV) == "1":
+        return {}
+    index = {}
+    for directory in _system_font_dirs():
+        for name, path in _index_dir(directory).items():
+            index.setdefault(name, path)
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def resolve(family):
+    """Path of the best available font file for `family`, or None"""
+    candidates = FAMILIES.get(family, [family])
+    # Any bundled candidate beats every system candidate
+    for index in (_bundled_index(), _system_index()):
+        for name in candidates:
+            path = index.get(name.lower())
+            if path:
+                return path
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def font_from_path(path, size):
+    """Open (once) the font at `path` in `size`"""
+    with profiling.stage("font"):
+        return ImageFont.truetype(path, size)
+
+
+def _default_font(size):
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:  # Pillow < 10.1 has no scalable default font
+        return ImageFont.load_default()
+
+
+def get_font(family, size):
+    """Cached font for `family` at `size`, falling back to Pillow's built-in font"""
+    path = resolve(family)
+    if path:
+        try:
+            return font_from_path(path, size)
+        except OSError:
+            pass
+    return _default_font(size)
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Golden-image regression check for the asset generators.
+
+Every generator (the scripts in pebble_assets.bench.BENCHMARKS plus the
+spec build) is run in its own temp directory on the benchmark fixture
+sources, with bundled fonts only and forced rebuilds, and each image it
+writes is compared with the committed reference under golden/<generator>/.
+
+The comparison is pixel-array based: the largest per-channel difference
+(alpha-premultiplied, so invisible pixels don't count) and a mean SSIM of
+the luminance over 8x8 blocks, all in numpy. Each
+output must stay within its tolerance - golden/tolerances.json maps glob
+patterns ("create_splash_images/*") to {max_error, min_ssim}, the first
+match wins, and anything it does not list must be pixel-identical. Failures get a heatmap (expected | actual | difference) under
+bench_results/golden-diff/.
+
+Usage (from the repo root):
+    python -m pebble_assets.golden                       # check everything
+    python -m pebble_assets.golden create_splash_images build
+    python -m pebble_assets.golden --update              # accept the current renders
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+from pebble_assets.bench import BENCHMARKS, REPO_ROOT, make_fixtures
+
+GOLDEN_DIR = os.path.join(REPO_ROOT, "golden")
+TOLERANCES_PATH = os.path.join(GOLDEN_DIR, "tolerances.json")
+DIFF_DIR = os.path.join(REPO_ROOT, "bench_results", "golden-diff")
+IMAGE_EXTENSIONS = (".png", ".webp", ".ico")
+DEFAULT_TOLERANCE = {"max_error": 0, "min_ssim": 1.0}
+SSIM_WINDOW = 8
+
+# Generator name -> command run from the fixture directory. Scripts go through
+# the benchmark child harness, so every golden run also smoke-tests the bench
+GENERATORS = dict(
+    {name: ["-m", "pebble_assets.bench", "--child", name] for name in BENCHMARKS},
+    build=["-m", "pebble_assets.build", "--jobs", "1"],
+)
+# Settings that would change the rendered pixels or encoding are pinned
+RENDER_ENV = {
+    "PEBBLE_ASSETS_FORCE": "1",
+    "PEBBLE_FONTS_BUNDLED_ONLY": "1",
+    "PEBBLE_PNG_PROFILE": "dev",
+    "PEBBLE_ANDROID_FORMAT": "png",
+    "PEBBLE_PNG_PALETTE": "0",
+}
+
+
+def _snapshot(workdir):
+    files = {}
+    for root, _, names in os.walk(workdir):
+        for name in names:
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            files[os.path.relpath(path, workdir).replace(os.sep, "/")] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def render(name, workdir):
+    """Run generator `name` in a fresh fixture `workdir`; returns the image paths it wrote"""
+    make_fixtures(workdir)
+    before = _snapshot(workdir)
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, **RENDER_ENV)
+    env.pop("PEBBLE_PROFILE", None)
+    proc = subprocess.run([sys.executable, *GENERATORS[name]], cwd=workdir, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{proc.stderr}")
+    after = _snapshot(workdir)
+    return sorted(path for path, stamp in after.items()
+                  if before.get(path) != stamp and path.lower().endswith(IMAGE_EXTENSIONS)
+                  and not path.startswith("assets/."))
+
+
+def _pixels(path):
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGBA"))
+
+
+def _premultiplied(path):
+    """Alpha-premultiplied RGBA pixels (Pillow's RGBa mode, converted in C)"""
+    with Image.open(path) as image:
+        return np.asarray(image.convert("RGBA").convert("RGBa"))
+
+
+def _block_means(values, window):
+    """Mean of each non-overlapping window x window block (partial edge blocks dropped)"""
+    rows, cols = values.shape[0] // window, values.shape[1] // window
+    blocks = values[:rows * window, :cols * window].reshape(rows, window, cols, window)
+    return blocks.mean(axis=(1, 3))
+
+
+def _luminance(pixels):
+    weights = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    # Transparency shows as darkness, so alpha changes are not invisible here
+    return pixels[..., :3].astype(np.float32) @ weights + (255 - pixels[..., 3].astype(np.float32))
+
+
+def ssim(expected, actual, window=SSIM_WINDOW):
+    """Mean SSIM of the luminance of two premultiplied RGBA arrays over window x window blocks"""
+    x, y = _luminance(expected), _luminance(actual)
+    window = max(1, min(window, *x.shape))
+    mean_x, mean_y = _block_means(x, window), _block_means(y, window)
+    var_x = _block_means(x * x, window) - mean_x ** 2
+    var_y = _block_means(y * y, window) - mean_y ** 2
+    cov = _block_means(x * y, window) - mean_x * mean_y
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    score = ((2 * mean_x * mean_y + c1) * (2 * cov + c2)
+             / ((mean_x ** 2 + mean_y ** 2 + c1) * (var_x + var_y + c2)))
+    return float(score.mean())
+
+
+def compare(expected_path, actual_path):
+    """{'max_error', 'mean_error', 'ssim'} of two images, or {'size': ...} if they differ in size"""
+    a, b = _premultiplied(expected_path), _premultiplied(actual_path)
+    if a.shape != b.shape:
+        return {"size": f"{a.shape[1]}x{a.shape[0]} -> {b.shape[1]}x{b.shape[0]}"}
+    if np.array_equal(a, b):
+        return {"max_error": 0, "mean_error": 0.0, "ssim": 1.0}
+    error = np.abs(a.astype(np.int16) - b)
+    return {"max_error": int(error.max()), "mean_error": float(error.mean()), "ssim": ssim(a, b)}
+
+
+def heatmap(expected_path, actual_path, output_path):
+    """Save expected | actual | difference (black -> red -> yellow -> white) side by side"""
+    expected, actual = _pixels(expected_path), _pixels(actual_path)
+    height = max(expected.shape[0], actual.shape[0])
+    width = max(expected.shape[1], actual.shape[1])
+
+    def padded(pixels):
+        canvas = np.zeros((height, width, 4), dtype=np.uint8)
+        canvas[:pixels.shape[0], :pixels.shape[1]] = pixels
+        return canvas
+
+    a, b = padded(expected), padded(actual)
+    premultiplied = [np.asarray(Image.fromarray(pixels).convert("RGBa")) for pixels in (a, b)]
+    error = np.abs(premultiplied[0].astype(np.int16) - premultiplied[1]).max(axis=-1)
+    # Amplify so a 1-level difference is still visible
+    level = np.clip(error * 16, 0, 765)
+    heat = np.stack([np.clip(level, 0, 255), np.clip(level - 255, 0, 255),
+                     np.clip(level - 510, 0, 255), np.full_like(level, 255)], axis=-1).astype(np.uint8)
+
+    checker = ((np.indices((height, width)).sum(axis=0) // 8) % 2 * 40 + 200).astype(np.uint8)
+    panels = []
+    for pixels in (a, b):
+        background = Image.fromarray(np.stack([checker] * 3 + [np.full_like(checker, 255)], axis=-1))
+        panels.append(Image.alpha_composite(background, Image.fromarray(pixels)))
+    panels.append(Image.fromarray(heat))
+
+    sheet = Image.new("RGBA", (width * 3 + 8, height), (255, 255, 255, 255))
+    for i, panel in enumerate(panels):
+        sheet.paste(panel, (i * (width + 4), 0))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    sheet.save(output_path)
+
+
+def load_tolerances(path=TOLERANCES_PATH):
+    """[(pattern, tolerance)] in file order"""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [(pattern, dict(DEFAULT_TOLERANCE, **tolerance))
+                for pattern, tolerance in json.load(f)["tolerances"].items()]
+
+
+def tolerance_for(key, tolerances):
+    for pattern, tolerance in tolerances:
+        if fnmatch.fnmatch(key, pattern):
+            return tolerance
+    return DEFAULT_TOLERANCE
+
+
+def within(result, tolerance):
+    return ("size" not in result and result["max_error"] <= tolerance["max_error"]
+            and result["ssim"] >= tolerance["min_ssim"])
+
+
+def check(name, workdir, outputs, tolerances, diff_dir=DIFF_DIR):
+    """Compare one generator's renders with its goldens; returns a list of failure messages"""
+    golden_root = os.path.join(GOLDEN_DIR, name)
+    failures = []
+    for relpath in outputs:
+        key = f"{name}/{relpath}"
+        golden_path = os.path.join(golden_root, relpath)
+        if not os.path.exists(golden_path):
+            failures.append(f"{key}: no golden image (run with --update to add it)")
+            continue
+        result = compare(golden_path, os.path.join(workdir, relpath))
+        tolerance = tolerance_for(key, tolerances)
+        if within(result, tolerance):
+            continue
+        if "size" in result:
+            failures.append(f"{key}: size changed {result['size']}")
+        else:
+            failures.append(f"{key}: max error {result['max_error']} (allowed {tolerance['max_error']}), "
+                            f"SSIM {result['ssim']:.5f} (min {tolerance['min_ssim']})")
+        heatmap(golden_path, os.path.join(workdir, relpath),
+                os.path.join(diff_dir, name, os.path.splitext(relpath)[0] + ".png"))
+
+    if os.path.isdir(golden_root):
+        for root, _, names in os.walk(golden_root):
+            for file_name in names:
+                relpath = os.path.relpath(os.path.join(root, file_name), golden_root).replace(os.sep, "/")
+                if relpath not in outputs:
+                    failures.append(f"{name}/{relpath}: no longer generated")
+    return failures
+
+
+def update(name, workdir, outputs):
+    """Replace the goldens of `name` with the current renders"""
+    golden_root = os.path.join(GOLDEN_DIR, name)
+    shutil.rmtree(golden_root, ignore_errors=True)
+    for relpath in outputs:
+        destination = os.path.join(golden_root, relpath)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if relpath.endswith(".png"):
+            # Only the pixels are compared, so store references as small as possible
+            with Image.open(os.path.join(workdir, relpath)) as image:
+                image.save(destination, optimize=True)
+        else:
+            shutil.copy(os.path.join(workdir, relpath), destination)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare generator outputs with the golden images")
+    parser.add_argument("generators", nargs="*",
+                        help=f"generators to check (default: all of {', '.join(GENERATORS)})")
+    parser.add_argument("--update", action="store_true",
+                        help="overwrite the golden images with the current renders")
+    parser.add_argument("--diff-dir", default=DIFF_DIR,
+                        help="where failure heatmaps go (default: bench_results/golden-diff)")
+    args = parser.parse_args(argv)
+
+    names = args.generators or list(GENERATORS)
+    unknown = [name for name in names if name not in GENERATORS]
+    if unknown:
+        print(f"❌ Unknown generator(s): {', '.join(unknown)}")
+        return 1
+
+    tolerances = load_tolerances()
+    shutil.rmtree(args.diff_dir, ignore_errors=True)
+    failures = []
+    checked = 0
+    render_time = diff_time = 0.0
+    for name in names:
+        with tempfile.TemporaryDirectory(prefix=f"golden-{name}-") as workdir:
+            start = time.perf_counter()
+            try:
+                outputs = render(name, workdir)
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                failures.append(f"{name}: generator failed")
+                continue
+            render_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            if args.update:
+                update(name, workdir, outputs)
+                print(f"📝 {name}: {len(outputs)} golden image(s) updated")
+                continue
+            problems = check(name, workdir, outputs, tolerances, args.diff_dir)
+            diff_time += time.perf_counter() - start
+            checked += len(outputs)
+            print(f"{'❌' if problems else '✅'} {name}: {len(outputs)} image(s), {len(problems)} failure(s)")
+            failures += problems
+
+    if args.update:
+        return 1 if failures else 0
+    print(f"\n⏱️ Rendering {render_time:.1f} s, diffing {checked} images {diff_time:.2f} s")
+    if failures:
+        print(f"\n{len(failures)} failure(s):")
+        for failure in failures:
+            print(f"  {failure}")
+        print(f"\n🔥 Heatmaps: {os.path.relpath(args.diff_dir, os.getcwd())}")
+        return 1
+    print("✅ All outputs match the golden images")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
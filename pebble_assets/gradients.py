@@ -0,0 +1,84 @@
+"""
+Whole-canvas gradient fills built as numpy arrays.
+
+Every gradient is described by a per-pixel factor field in [0, 1] and
+blended the same way the original putpixel loops did:
+
+    channel = int(start - (start - end) * factor * strength)
+
+The float operations run in the same order as those loops, so the
+resulting pixels are identical to the per-pixel versions.
+"""
+
+import numpy as np
+from PIL import Image
+
+
+def _mode_for(color):
+    return 'RGBA' if len(color) == 4 else 'RGB'
+
+
+def _blend(factor, start, end, strength=1.0):
+    """Blend start -> end over a 2D factor field, returning an image"""
+    channels = []
+    for s, e in zip(start, end):
+        value = s - (s - e) * factor * strength
+        channels.append(value.astype(np.int64))
+    pixels = np.stack(channels, axis=-1).clip(0, 255).astype(np.uint8)
+    return Image.fromarray(pixels, _mode_for(start))
+
+
+def _grid(size):
+    width, height = size
+    y, x = np.mgrid[0:height, 0:width]
+    return x, y
+
+
+def linear_gradient(size, start, end, direction='vertical', strength=1.0):
+    """Gradient along one axis ('vertical' = top to bottom, 'horizontal' = left to right)"""
+    width, height = size
+    x, y = _grid(size)
+    if direction == 'vertical':
+        factor = y / height
+    elif direction == 'horizontal':
+        factor = x / width
+    else:
+        raise ValueError(f"Unknown gradient direction: {direction}")
+    return _blend(factor, start, end, strength)
+
+
+def diagonal_gradient(size, start, end, strength=1.0):
+    """Gradient from the top-left corner to the bottom-right corner"""
+    width, height = size
+    x, y = _grid(size)
+    factor = (x + y) / (width + height)
+    return _blend(factor, start, end, strength)
+
+
+def radial_gradient(size, start, end, center=None, strength=1.0):
+    """Gradient from the center outwards, reaching `end` at the farthest corner"""
+    width, height = size
+    cx, cy = center if center else (width / 2, height / 2)
+    x, y = _grid(size)
+    max_radius = max(
+        np.hypot(cx, cy), np.hypot(width - cx, cy),
+        np.hypot(cx, height - cy), np.hypot(width - cx, height - cy),
+    )
+    factor = np.minimum(np.hypot(x - cx, y - cy) / max_radius, 1.0)
+    return _blend(factor, start, end, strength)
+
+
+def falloff_gradient(size, top, bottom, falloff):
+    """
+    Vertical gradient from `top` to `bottom`, darkened towards the left and
+    right edges by up to `falloff` levels (the feature graphic background).
+    """
+    width, height = size
+    x, y = _grid(size)
+    h_factor = np.abs(x - width / 2) / (width / 2)
+    channels = []
+    for t, b in zip(top, bottom):
+        row_value = (t + (y / height) * (b - t)).astype(np.int64)
+        channels.append((row_value - h_factor * falloff).astype(np.int64))
+    pixels = np.stack(channels, axis=-1).clip(0, 255).astype(np.uint8)
+    return Image.fromarray(pixels, _mode_for(top))
@@ -0,0 +1,79 @@
+"""
+Multi-resolution Windows .ico writer.
+
+Pillow's ICO plugin resizes every entry itself and stores them all in one
+format. Here the caller hands in frames it already has (normally straight
+from the shared resize pyramid, so the 32 px favicon and the 48 px mdpi
+launcher icon are the very same images), and each entry is stored the way
+Windows expects it:
+
+    16-48 px   32-bit BGRA DIB plus a 1-bit AND mask (readable everywhere)
+    64+ px     PNG (Vista and later; a fraction of the DIB size)
+"""
+
+import io
+import struct
+
+from pebble_assets import profiling
+from pebble_assets.encoder import png_params
+from pebble_assets.writer import write_bytes
+
+ICO_SIZES = (16, 24, 32, 48, 64, 256)
+PNG_MIN_SIZE = 64
+
+
+def ico_sizes(largest):
+    """The standard entry sizes up to `largest`"""
+    return [size for size in ICO_SIZES if size <= largest]
+
+
+def _dib(image):
+    """BITMAPINFOHEADER, bottom-up BGRA pixels and the AND mask of an RGBA frame"""
+    width, height = image.size
+    # The DIB height counts the XOR (colour) and AND (mask) halves
+    header = struct.pack('<IiiHHIIiiII', 40, width, height * 2, 1, 32, 0, 0, 0, 0, 0, 0)
+    pixels = image.tobytes('raw', 'BGRA', 0, -1)
+    mask = image.getchannel('A').point(lambda alpha: 255 if alpha == 0 else 0, '1')
+    mask_stride = (width + 31) // 32 * 4
+    return header + pixels + mask.tobytes('raw', '1', mask_stride, -1)
+
+
+def _png(image):
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', **png_params())
+    return buffer.getvalue()
+
+
+def encode_ico(frames):
+    """
+    ICO file bytes for `frames`, a {size: square RGBA image} mapping
+    (at most 256 px per entry). Entries are written smallest first.
+    """
+    entries = []
+    with profiling.stage("encode"):
+        for size in sorted(frames):
+            image = frames[size]
+            if image.size != (size, size):
+                raise ValueError(f"ICO frame for {size} px is {image.width}x{image.height}")
+            if size > 256:
+                raise ValueError(f"ICO entries are at most 256 px, got {size}")
+            if image.mode != 'RGBA':
+                image = image.convert('RGBA')
+            entries.append((size, _png(image) if size >= PNG_MIN_SIZE else _dib(image)))
+
+    header = struct.pack('<HHH', 0, 1, len(entries))
+    offset = len(header) + 16 * len(entries)
+    directory = []
+    for size, data in entries:
+        # 0 in the width/height bytes means 256
+        directory.append(struct.pack('<BBBBHHII', size % 256, size % 256, 0, 0, 1, 32,
+                                     len(data), offset))
+        offset += len(data)
+    return header + b''.join(directory) + b''.join(data for _, data in entries)
+
+
+def save_ico(frames, path):
+    """Write `frames` ({size: image}) to `path` as one multi-resolution .ico"""
+    data = encode_ico(frames)
+    write_bytes(path, data)
+    return data
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Exact and perceptual hash index of the images under assets/.
+
+For every image the index stores its sha256 plus two 64-bit perceptual
+hashes of the picture flattened on white:
+
+    dHash  sign of the horizontal gradient on a 9x8 thumbnail
+    pHash  sign of the lowest 8x8 DCT coefficients of a 32x32 thumbnail
+           against their median
+
+Byte-identical files share a sha256; visually near-identical renders (a
+re-export, a different size, a slightly different crop) have hashes a few
+bits apart. Entries are keyed by path and reused while the file's size and
+mtime are unchanged, so an update only decodes new or edited files, and a
+query compares packed uint64 arrays without opening any image.
+
+Usage (from the repo root):
+    python -m pebble_assets.image_index                 # all duplicate groups
+    python -m pebble_assets.image_index assets/icon/icon.png
+    python -m pebble_assets.image_index --threshold 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+INDEX_PATH = "assets/.image-index.json"
+ROOT = "assets"
+EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp")
+# Bump when the hashing changes; older indexes are rebuilt
+VERSION = 1
+DEFAULT_THRESHOLD = 6
+
+
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT32 = _dct_matrix(32)
+
+
+def _pack(bits):
+    """64 booleans -> int"""
+    return int.from_bytes(np.packbits(bits.astype(np.uint8)).tobytes(), "big")
+
+
+def _grayscale(path):
+    """Decode `path` as an 8-bit grayscale image flattened on white, decoding small where possible"""
+    with Image.open(path) as image:
+        # JPEGs can decode straight to a fraction of their size
+        image.draft("RGB", (64, 64))
+        image.load()
+        if image.mode in ("RGBA", "LA", "P", "PA") or "transparency" in image.info:
+            image = image.convert("RGBA")
+            flat = Image.new("RGBA", image.size, (255, 255, 255, 255))
+            image = Image.alpha_composite(flat, image)
+        # Cheap box reduction of huge drafts before the real resample
+        factor = min(image.size) // 64
+        if factor > 1:
+            image = image.reduce(factor)
+        return image.convert("L")
+
+
+def dhash(gray):
+    pixels = np.asarray(gray.resize((9, 8), Image.Resampling.LANCZOS), dtype=np.int16)
+    return _pack(pixels[:, 1:] > pixels[:, :-1])
+
+
+def phash(gray):
+    pixels = np.asarray(gray.resize((32, 32), Image.Resampling.LANCZOS), dtype=np.float64)
+    low = (_DCT32 @ pixels @ _DCT32.T)[:8, :8].ravel()
+    return _pack(low > np.median(low[1:]))
+
+
+def hash_file(path):
+    """{'sha256', 'dhash', 'phash'} for one image file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    gray = _grayscale(path)
+    return {
+        "sha256": digest.hexdigest(),
+        "dhash": f"{dhash(gray):016x}",
+        "phash": f"{phash(gray):016x}",
+    }
+
+
+def _popcount(values):
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(values)
+    return np.unpackbits(values.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+
+class ImageIndex:
+    """Image path -> hashes, persisted as JSON and refreshed by (size, mtime)"""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == VERSION:
+                    self.entries = data["entries"]
+            except (OSError, ValueError, KeyError):
+                print(f"⚠️ Ignoring unreadable image index: {path}")
+        self._arrays = None
+
+    def update(self, root=ROOT):
+        """Hash new and changed images under `root`, drop deleted ones; returns (hashed, removed)"""
+        seen = set()
+        hashed = 0
+        for folder, _, names in os.walk(root):
+            for name in names:
+                if not name.lower().endswith(EXTENSIONS):
+                    continue
+                path = os.path.join(folder, name).replace(os.sep, "/")
+                seen.add(path)
+                stat = os.stat(path)
+                stamp = [stat.st_size, stat.st_mtime_ns]
+                entry = self.entries.get(path)
+                if entry and entry["stamp"] == stamp:
+                    continue
+                try:
+                    self.entries[path] = dict(hash_file(path), stamp=stamp)
+                except OSError as e:
+                    print(f"⚠️ Skipping {path}: {e}")
+                    continue
+                hashed += 1
+        removed = [path for path in self.entries
+                   if path not in seen and path.startswith(root.rstrip("/") + "/")]
+        for path in removed:
+            del self.entries[path]
+        if hashed or removed:
+            self._arrays = None
+        return hashed, len(removed)
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": VERSION, "entries": self.entries}, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def _packed(self):
+        if self._arrays is None:
+            paths = sorted(self.entries)
+            self._arrays = (
+                paths,
+                np.array([self.entries[p]["sha256"] for p in paths]),
+                np.array([int(self.entries[p]["dhash"], 16) for p in paths], dtype=np.uint64),
+                np.array([int(self.entries[p]["phash"], 16) for p in paths], dtype=np.uint64),
+            )
+        return self._arrays
+
+    def similar(self, path, threshold=DEFAULT_THRESHOLD):
+        """
+        [(other_path, distance, exact)] for files within `threshold` bits of
+        `path` on both hashes, closest first. `path` need not be indexed.
+        """
+        path = path.replace(os.sep, "/")
+        entry = self.entries.get(path) or hash_file(path)
+        paths, shas, dhashes, phashes = self._packed()
+        distance = np.maximum(
+            _popcount(dhashes ^ np.uint64(int(entry["dhash"], 16))),
+            _popcount(phashes ^ np.uint64(int(entry["phash"], 16))))
+        exact = shas == entry["sha256"]
+        hits = np.flatnonzero((distance <= threshold) | exact)
+        matches = [(paths[i], 0 if exact[i] else int(distance[i]), bool(exact[i]))
+                   for i in hits if paths[i] != path]
+        return sorted(matches, key=lambda match: (match[1], not match[2], match[0]))
+
+    def duplicate_groups(self, threshold=DEFAULT_THRESHOLD):
+        """Groups of 2+ paths linked by exact or near-duplicate matches, largest first"""
+        paths, shas, dhashes, phashes = self._packed()
+        parent = list(range(len(paths)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i in range(len(paths) - 1):
+            distance = np.maximum(_popcount(dhashes[i + 1:] ^ dhashes[i]),
+                                  _popcount(phashes[i + 1:] ^ phashes[i]))
+            linked = (distance <= threshold) | (shas[i + 1:] == shas[i])
+            for j in np.flatnonzero(linked) + i + 1:
+                parent[find(j)] = find(i)
+
+        groups = {}
+        for i, path in enumerate(paths):
+            groups.setdefault(find(i), []).append(path)
+        return sorted((group for group in groups.values() if len(group) > 1),
+                      key=lambda group: (-len(group), group[0]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Find duplicate and near-duplicate images under assets/")
+    parser.add_argument("paths", nargs="*", help="images to look up (default: list all groups)")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD,
+                        help=f"max differing hash bits for a near duplicate "
+                             f"(default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--root", default=ROOT, help=f"folder to index (default: {ROOT})")
+    args = parser.parse_args(argv)
+
+    index = ImageIndex()
+    start = time.perf_counter()
+    hashed, removed = index.update(args.root)
+    if hashed or removed:
+        index.save()
+    print(f"🔎 Indexed {len(index.entries)} images ({hashed} hashed, {removed} removed) "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    if args.paths:
+        for path in args.paths:
+            if not os.path.exists(path):
+                print(f"❌ Not found: {path}")
+                return 1
+            matches = index.similar(path, args.threshold)
+            print(f"\n{path}: {len(matches)} match(es)")
+            for other, distance, exact in matches:
+                print(f"  {'identical' if exact else f'{distance:2d} bits':>9}  {other}")
+    else:
+        groups = index.duplicate_groups(args.threshold)
+        for group in groups:
+            print(f"\n{len(group)} similar images:")
+            for path in group:
+                print(f"  {path}")
+        if not groups:
+            print("No duplicates found")
+    print(f"\n⏱️ Query took {(time.perf_counter() - start) * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Content-hash manifest for incremental asset builds.
+
+For every output the manifest records a hash of everything that went into
+it: the bytes of its source files, the generator code, the target
+parameters (size, mode, ...) and the Pillow version. A rerun computes the
+same key and skips outputs whose key is unchanged and whose file on disk is
+still the one we wrote.
+
+"Generator code" is the whole module each generator function lives in plus
+every repo module it imports, directly or indirectly (including imports
+inside functions), so editing a helper such as the source cache or the
+font loader invalidates every output built through it.
+
+Several scripts may run at once: save() merges this run's records into
+whatever is on disk instead of overwriting other processes' entries.
+
+Usage in a generator script:
+
+    manifest = AssetManifest()
+    key = manifest.input_key(render_splash_image, sources=[logo], size=(w, h))
+    if not manifest.is_fresh(output_path, key):
+        ...render and save...
+        manifest.record(output_path, key)
+    manifest.save()
+
+Set PEBBLE_ASSETS_FORCE=1 (or delete the manifest) to rebuild everything.
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import threading
+
+import PIL
+
+from pebble_assets.encoder import current_profile, output_path as resolve_output, palette_enabled
+
+MANIFEST_PATH = "assets/.asset-manifest.json"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_closures = {}
+_file_digests = {}
+_closures_lock = threading.Lock()
+
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _module_file(name):
+    """Path of repo module `name` ('pebble_assets.pyramid', 'generate_splash_from_image'), or None"""
+    base = os.path.join(REPO_ROOT, *name.split("."))
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _imported_files(path):
+    """Repo modules imported anywhere in the file at `path`"""
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+            # `from pebble_assets import profiling` imports a submodule
+            names += [f"{node.module}.{alias.name}" for alias in node.names]
+    return {found for found in map(_module_file, names) if found}
+
+
+def code_files(path):
+    """`path` plus every repo module it imports, transitively, sorted"""
+    stamp = (path, os.stat(path).st_mtime_ns)
+    with _closures_lock:
+        files = _closures.get(stamp)
+    if files is None:
+        seen = set()
+        pending = [os.path.abspath(path)]
+        while pending:
+            current = pending.pop()
+            if current not in seen:
+                seen.add(current)
+                pending += _imported_files(current) - seen
+        files = sorted(seen)
+        with _closures_lock:
+            _closures[stamp] = files
+    return files
+
+
+def _file_digest(path):
+    stat = os.stat(path)
+    stamp = (path, stat.st_mtime_ns, stat.st_size)
+    digest = _file_digests.get(stamp)
+    if digest is None:
+        with open(path, "rb") as f:
+            digest = _file_digests[stamp] = hashlib.sha256(f.read()).digest()
+    return digest
+
+
+def code_hash(*generators):
+    """sha256 over the source of the modules `generators` live in and all repo modules they import"""
+    files = sorted({file for func in generators for file in code_files(inspect.getsourcefile(func))})
+    h = hashlib.sha256()
+    for path in files:
+        h.update(os.path.relpath(path, REPO_ROOT).replace(os.sep, "/").encode("utf-8") + b"\0")
+        h.update(_file_digest(path))
+    return h.hexdigest()
+
+
+class AssetManifest:
+    """Output path -> input hash records, persisted as JSON"""
+
+    def __init__(self, path=MANIFEST_PATH, force=None):
+        self.path = path
+        if force is None:
+            force = os.environ.get("PEBBLE_ASSETS_FORCE") == "1"
+        self.force = force
+        self._source_hashes = {}
+        self._recorded = {}
+        self.entries = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            print(f"⚠️ Ignoring unreadable manifest: {self.path}")
+            return {}
+
+    def _source_hash(self, path):
+        """sha256 of a source file, computed once per (path, mtime, size)"""
+        stamp = (os.path.abspath(path), *_file_stamp(path))
+        digest = self._source_hashes.get(stamp)
+        if digest is None:
+            h = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            self._source_hashes[stamp] = digest
+        return digest
+
+    def input_key(self, *generators, sources=(), **params):
+        """
+        Hash of generator code, source bytes, parameters, Pillow version and
+        PNG settings. `generators` name what produces the output; the code
+        hashed is their modules and everything those import (see code_hash).
+        """
+        payload = {
+            "pillow": PIL.__version__,
+            "png_profile": current_profile(),
+            "png_palette": palette_enabled(),
+            "generators": [f"{func.__module__}.{func.__qualname__}" for func in generators],
+            "code": code_hash(*generators),
+            "sources": [
+                [os.path.normpath(src), self._source_hash(src) if os.path.exists(src) else None]
+                if src else None
+                for src in sources
+            ],
+            "params": params,
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def is_fresh(self, output_path, key):
+        """True when `output_path` was built from `key` and is untouched since"""
+        output_path = resolve_output(output_path)
+        if self.force or not os.path.exists(output_path):
+            return False
+        entry = self.entries.get(os.path.normpath(output_path))
+        return bool(entry) and entry["key"] == key and entry["stamp"] == _file_stamp(output_path)
+
+    def record(self, output_path, key):
+        """Remember that `output_path` was just written from `key`"""
+        output_path = resolve_output(output_path)
+        entry = {"key": key, "stamp": _file_stamp(output_path)}
+        self.entries[os.path.normpath(output_path)] = entry
+        self._recorded[os.path.normpath(output_path)] = entry
+
+    def save(self):
+        """Merge this run's records into the manifest on disk"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Re-read so records another script saved since we loaded are kept
+        entries = self._load()
+        entries.update(self._recorded)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self.entries = entries
+        self._recorded = {}
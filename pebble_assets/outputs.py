@@ -0,0 +1,67 @@
+"""
+Writing generated images to their destinations.
+
+Several platforms ask for the same pixels under different names (iOS 29pt@1x
+for iPhone and iPad, Android round vs. square launcher icons, web maskable
+icons, ...). Targets that share a render key are grouped so each unique
+image is rendered and PNG-encoded once, and the encoded bytes are copied to
+every destination (atomically, and only where they differ from what is
+already there - see pebble_assets.writer).
+"""
+
+import io
+
+from pebble_assets import profiling
+from pebble_assets.encoder import (output_path as resolve_output, png_params, prepare_png,
+                                    remove_stale_sibling, report_saving, save_params)
+from pebble_assets.writer import write_bytes
+
+
+def group_targets(targets):
+    """
+    Collapse [(output_path, key)] into [(key, [output_paths])].
+
+    Keys keep their first-seen order and a path listed twice is only written
+    once.
+    """
+    groups = {}
+    for output_path, key in targets:
+        paths = groups.setdefault(key, [])
+        if output_path not in paths:
+            paths.append(output_path)
+    return list(groups.items())
+
+
+def encode_image(image, format='PNG', **params):
+    """Encode `image` to bytes in memory (PNGs use the active encoder profile)"""
+    if format == 'PNG' and not params:
+        params = png_params()
+    with profiling.stage("encode"):
+        buffer = io.BytesIO()
+        image.save(buffer, format, **params)
+        return buffer.getvalue()
+
+
+def save_copies(image, output_paths, format='PNG', **params):
+    """
+    Encode `image` once per output format and write the same bytes to every
+    output path. PNG paths that are Android resources in WebP mode are
+    written as `.webp` (see encoder.output_path).
+    """
+    # Only default PNG saves follow the active profile and Android format
+    managed = format == 'PNG' and not params
+    encoded = {}
+    for output_path in output_paths:
+        if managed:
+            output_path = resolve_output(output_path)
+            file_format, file_params = save_params(output_path)
+        else:
+            file_format, file_params = format, params
+        cache_key = (file_format, tuple(sorted(file_params.items())))
+        if cache_key not in encoded:
+            encodable = prepare_png(image) if managed and file_format == 'PNG' else image
+            encoded[cache_key] = encode_image(encodable, file_format, **file_params)
+        old_size = remove_stale_sibling(output_path) if managed else None
+        write_bytes(output_path, encoded[cache_key])
+        report_saving(output_path, old_size)
+    return next(iter(encoded.values()), b'')
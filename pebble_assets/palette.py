@@ -0,0 +1,100 @@
+"""
+Indexed-palette PNGs for flat-colour assets.
+
+Most generated assets are brand orange, white and a few anti-aliasing
+shades, yet Pillow stores them as 24/32-bit truecolor. `palettize` turns
+such an image into an 8-bit (or smaller) palette image:
+
+  * up to 256 distinct colours: an exact palette, no quality change
+  * more: a palette of the image's own colours picked greedily (farthest
+    colour first) until every colour is within `tolerance` levels of a
+    palette entry, alpha-premultiplied so the colour of invisible pixels
+    does not count
+
+Alpha is kept as a palette transparency (tRNS) chunk. Images that cannot
+be covered by 256 entries within the tolerance - photos, gradients - come
+back as None and stay truecolor. The error bound is exact: it is measured
+on every distinct colour, not sampled, and a reduced palette is checked
+against the original pixels with `max_error` before it is returned.
+"""
+
+import numpy as np
+from PIL import Image
+
+DEFAULT_TOLERANCE = 6
+MAX_COLORS = 256
+# Images with more distinct colours than this are not flat artwork
+MAX_DISTINCT = 1 << 16
+
+
+def _premultiplied(pixels):
+    pixels = pixels.astype(np.int32)
+    alpha = pixels[..., 3:4]
+    return np.concatenate([pixels[..., :3] * alpha // 255, alpha], axis=-1)
+
+
+def max_error(original, candidate):
+    """Largest per-channel difference between two images, alpha-premultiplied"""
+    a = _premultiplied(np.asarray(original.convert('RGBA')))
+    b = _premultiplied(np.asarray(candidate.convert('RGBA')))
+    return int(np.abs(a - b).max()) if a.size else 0
+
+
+def _distances(colors, reference):
+    return np.abs(colors - reference).max(axis=-1)
+
+
+def _choose_palette(premultiplied, counts, tolerance):
+    """Indices of the colours to keep, or None if 256 cannot cover them all"""
+    chosen = [int(np.argmax(counts))]
+    distance = _distances(premultiplied, premultiplied[chosen[0]])
+    while distance.max() > tolerance:
+        if len(chosen) == MAX_COLORS:
+            return None
+        farthest = int(np.argmax(distance))
+        chosen.append(farthest)
+        distance = np.minimum(distance, _distances(premultiplied, premultiplied[farthest]))
+    return np.array(chosen)
+
+
+def palettize(image, tolerance=DEFAULT_TOLERANCE):
+    """Palette version of an RGB/RGBA `image`, or None when it would be off by more than allowed"""
+    if image.mode not in ('RGB', 'RGBA'):
+        return None
+    rgba = image.convert('RGBA')
+    colors = rgba.getcolors(MAX_DISTINCT)
+    if not colors:
+        return None
+
+    counts = np.array([count for count, _ in colors])
+    values = np.array([color for _, color in colors], dtype=np.uint8)
+    if len(values) <= MAX_COLORS:
+        palette_of = np.arange(len(values))
+        palette = values
+    else:
+        premultiplied = _premultiplied(values)
+        chosen = _choose_palette(premultiplied, counts, tolerance)
+        if chosen is None:
+            return None
+        # Each distinct colour -> its nearest palette entry
+        palette_of = np.empty(len(values), dtype=np.intp)
+        for start in range(0, len(values), 4096):
+            block = premultiplied[start:start + 4096, None, :]
+            palette_of[start:start + 4096] = _distances(block, premultiplied[chosen][None]).argmin(axis=1)
+        palette = values[chosen]
+
+    # Pixel -> distinct colour -> palette index, via the packed RGBA value
+    keys = values.view('<u4').reshape(-1)
+    order = np.argsort(keys)
+    pixels = np.ascontiguousarray(np.asarray(rgba)).view('<u4').reshape(rgba.height, rgba.width)
+    distinct = order[np.searchsorted(keys[order], pixels)]
+    result = Image.fromarray(palette_of[distinct].astype(np.uint8), 'P')
+
+    if palette[:, 3].min() < 255:
+        result.putpalette(palette.tobytes(), 'RGBA')
+    else:
+        result.putpalette(palette[:, :3].tobytes(), 'RGB')
+    # An exact palette is lossless; check a reduced one on the decoded pixels
+    if len(values) > MAX_COLORS and max_error(rgba, result) > tolerance:
+        return None
+    return result
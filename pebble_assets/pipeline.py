@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Chained in-memory transforms for the fix_* post-processors.
+
+A Pipeline is a list of steps, each a function from one PIL image to the
+next. The steps run on the decoded image and the result is encoded and
+written once, so flattening and recentering an icon costs one decode and
+one PNG encode instead of one of each per script.
+
+    Pipeline(trim_and_recenter(), flatten()).run('.../ic_launcher.png')
+
+`apply` runs the same chain on an image already in memory, e.g. after a
+`resize` step on a decoded source, so nothing touches disk in between.
+
+Presets in PRESETS can be chained from the command line (from the repo
+root); they run over the Android mipmap folders:
+    python -m pebble_assets.pipeline whitespace transparent
+
+Pillow is imported inside the steps, not at module level, so the CLI can
+read PRESETS without loading any imaging code.
+"""
+
+import argparse
+import os
+import sys
+
+from pebble_assets import profiling, writer
+from pebble_assets.encoder import save_png
+
+ORANGE = (255, 149, 0)  # #FF9500
+# Android adaptive icons only guarantee the central 66dp of the 108dp canvas
+SAFE_ZONE = 66 / 108
+
+MIPMAP_FOLDERS = [
+    'android/app/src/main/res/mipmap-mdpi',
+    'android/app/src/main/res/mipmap-hdpi',
+    'android/app/src/main/res/mipmap-xhdpi',
+    'android/app/src/main/res/mipmap-xxhdpi',
+    'android/app/src/main/res/mipmap-xxxhdpi',
+]
+
+
+def _rgba(color):
+    if isinstance(color, str):
+        from PIL import ImageColor
+        color = ImageColor.getrgb(color)
+    color = tuple(color)
+    return color if len(color) == 4 else color + (255,)
+
+
+def flatten(color=ORANGE):
+    """Step: composite onto an opaque `color` and drop the alpha channel"""
+    def step(image):
+        from PIL import Image
+        background = Image.new('RGBA', image.size, _rgba(color))
+        return Image.alpha_composite(background, image.convert('RGBA')).convert('RGB')
+    return step
+
+
+def trim_and_recenter(color=ORANGE):
+    """Step: crop to the visible content and center it on a `color` canvas of the same size"""
+    def step(image):
+        from PIL import Image
+        image = image.convert('RGBA')
+        bbox = image.getbbox()
+        if not bbox:
+            return image
+        cropped = image.crop(bbox)
+        canvas = Image.new('RGBA', image.size, _rgba(color))
+        x = (image.width - cropped.width) // 2
+        y = (image.height - cropped.height) // 2
+        canvas.paste(cropped, (x, y), cropped)
+        return canvas
+    return step
+
+
+def resize(size):
+    """Step: Lanczos resize to `size` (an int for squares or a (width, height) pair)"""
+    size = (size, size) if isinstance(size, int) else tuple(size)
+
+    def step(image):
+        from PIL import Image
+        if image.size == size:
+            return image
+        return image.resize(size, Image.Resampling.LANCZOS)
+    return step
+
+
+def pad_to_safe_zone(ratio=SAFE_ZONE, color=None):
+    """
+    Step: shrink the visible content until it fits in the central `ratio` of
+    the canvas, centered on `color` (transparent when None).
+    """
+    def step(image):
+        from PIL import Image
+        image = image.convert('RGBA')
+        bbox = image.getbbox()
+        if not bbox:
+            return image
+        content = image.crop(bbox)
+        limit = ratio * min(image.size)
+        scale = min(1.0, limit / max(content.size))
+        if scale < 1.0:
+            content = content.resize(
+                (max(1, round(content.width * scale)), max(1, round(content.height * scale))),
+                Image.Resampling.LANCZOS)
+        canvas = Image.new('RGBA', image.size, _rgba(color) if color else (0, 0, 0, 0))
+        x = (image.width - content.width) // 2
+        y = (image.height - content.height) // 2
+        canvas.alpha_composite(content, (x, y))
+        return canvas
+    return step
+
+
+def _same_pixels(a, b):
+    """True when `a` and `b` show the same RGBA pixels, whatever their modes"""
+    if a.size != b.size:
+        return False
+    if a.mode == b.mode:
+        return a.tobytes() == b.tobytes()
+    return a.convert('RGBA').tobytes() == b.convert('RGBA').tobytes()
+
+
+class Pipeline:
+    """An ordered chain of image steps, written to disk once at the end"""
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+
+    def then(self, *steps):
+        """A new pipeline with `steps` appended"""
+        return Pipeline(*self.steps, *steps)
+
+    def apply(self, image):
+        for step in self.steps:
+            image = step(image)
+        return image
+
+    def run(self, input_path, output_path=None):
+        """
+        Decode `input_path`, apply every step and save to `output_path`
+        (default: in place). In place, a file whose pixels the steps leave
+        as they were is not re-encoded. Returns True if the output was saved.
+        """
+        from PIL import Image
+        with profiling.target(output_path or input_path):
+            with profiling.stage("decode"), Image.open(input_path) as image:
+                image.load()
+            with profiling.stage("transform"):
+                result = self.apply(image)
+            if output_path is None and _same_pixels(image, result):
+                return False
+            save_png(result, output_path or input_path)
+        return True
+
+    def run_folders(self, folders):
+        """Run in place on every PNG/WebP in `folders`, returning the paths it changed"""
+        written = []
+        for folder in folders:
+            if not os.path.exists(folder):
+                continue
+            for name in sorted(os.listdir(folder)):
+                if name.endswith(('.png', '.webp')):
+                    path = os.path.join(folder, name)
+                    if self.run(path):
+                        print(f'Fixed: {path}')
+                        written.append(path)
+                    else:
+                        print(f'Already fixed: {path}')
+        return written
+
+
+PRESETS = {
+    'transparent': [flatten()],
+    'whitespace': [trim_and_recenter()],
+    'safe-zone': [pad_to_safe_zone()],
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Apply chained presets to the Android launcher icons with one write per file")
+    parser.add_argument('presets', nargs='+', choices=sorted(PRESETS),
+                        help="presets to apply, in order")
+    parser.add_argument('--folder', action='append', dest='folders',
+                        help="folder to process (repeatable; default: the mipmap folders)")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiling.start(args)
+
+    steps = [step for name in args.presets for step in PRESETS[name]]
+    written = Pipeline(*steps).run_folders(args.folders or MIPMAP_FOLDERS)
+    print(f"✅ Applied {' -> '.join(args.presets)} to {len(written)} file(s)")
+    writer.print_summary()
+    profiling.finish(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+Opt-in per-stage timing for the generators.
+
+Code marks its expensive steps with `stage()` and the unit of work it is
+producing with `target()`:
+
+    with profiling.target(output_path):
+        with profiling.stage("decode"):
+            ...
+
+Both are no-ops until `enable()` is called (every generator wires this to
+`--profile [TRACE]`: argparse-based scripts through `add_arguments` and
+`start`, the one-off drawing scripts through `session`). Once enabled, each span is recorded with its thread,
+the innermost target it ran under and its self time (duration minus the
+stages nested inside it), and `finish()` writes a Chrome trace
+(chrome://tracing or https://ui.perfetto.dev) and prints the slowest
+targets and stages.
+
+Stage names used across the tree: decode, reduce, resample, draw, text,
+font, composite, filter, transform, palettize, encode, write. Icon sizes
+spend their time in ResizePyramid.resize ("resample", with the 2x cascade
+it extends on the way as "reduce") under render_icon's target.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+PROFILE_ENV = "PEBBLE_PROFILE"
+DEFAULT_TRACE = "bench_results/profile-trace.json"
+DEFAULT_TOP = 10
+
+_enabled = False
+_trace_path = None
+_events = []
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullSpan()
+
+
+class _Span:
+    """One timed region; nested spans subtract from their parent's self time"""
+
+    def __init__(self, name, category):
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        stack = _stack()
+        self.children = 0
+        self.target = _local.targets[-1] if getattr(_local, "targets", None) else None
+        if self.category == "target":
+            _local.targets = getattr(_local, "targets", []) + [self.name]
+        stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter_ns() - self.start
+        stack = _stack()
+        stack.pop()
+        if self.category == "target":
+            _local.targets = _local.targets[:-1]
+        else:
+            # Targets are containers: their time is not a stage's time
+            for parent in reversed(stack):
+                if parent.category != "target":
+                    parent.children += duration
+                    break
+        event = {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": self.start / 1000,
+            "dur": duration / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {"target": self.target, "self_us": (duration - self.children) / 1000},
+        }
+        with _lock:
+            _events.append(event)
+        return False
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def enable(trace_path=DEFAULT_TRACE):
+    """Start recording spans; `trace_path` is where finish() writes the trace (None: don't)"""
+    global _enabled, _trace_path
+    _enabled = True
+    _trace_path = trace_path
+
+
+def enabled():
+    return _enabled
+
+
+def stage(name):
+    """Context manager timing one stage (decode, resample, draw, encode, ...)"""
+    return _Span(name, "stage") if _enabled else _NULL
+
+
+def target(name):
+    """Context manager grouping the stages that produce one output or spec target"""
+    return _Span(name, "target") if _enabled else _NULL
+
+
+def timed(name):
+    """Decorator: run the function as stage `name`"""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name, "stage"):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def drain():
+    """Remove and return the recorded events (used to ship them out of worker processes)"""
+    with _lock:
+        events = _events[:]
+        del _events[:]
+    return events
+
+
+def merge(events):
+    """Add events recorded elsewhere (e.g. returned from a worker process)"""
+    with _lock:
+        _events.extend(events)
+
+
+def write_trace(path, events=None):
+    """Write `events` (default: everything recorded) as Chrome trace JSON"""
+    events = _events if events is None else events
+    threads = sorted({(event["pid"], event["tid"]) for event in events})
+    metadata = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                 "args": {"name": f"worker {i}" if i else "main"}}
+                for i, (pid, tid) in enumerate(threads)]
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+    os.replace(tmp_path, path)
+
+
+def summarize(events=None, top=DEFAULT_TOP):
+    """
+    (targets, stages, pairs) ranked slowest first:
+      targets  [(name, wall ms)]
+      stages   [(name, self ms, calls)]
+      pairs    [((target, stage), self ms)]
+    """
+    events = _events if events is None else events
+    targets = defaultdict(float)
+    stages = defaultdict(lambda: [0.0, 0])
+    pairs = defaultdict(float)
+    for event in events:
+        if event["cat"] == "target":
+            targets[event["name"]] += event["dur"] / 1000
+            continue
+        self_ms = event["args"]["self_us"] / 1000
+        stages[event["name"]][0] += self_ms
+        stages[event["name"]][1] += 1
+        pairs[(event["args"]["target"] or "(no target)", event["name"])] += self_ms
+
+    def ranked(items):
+        return sorted(items, key=lambda item: item[1], reverse=True)[:top]
+
+    return (ranked(targets.items()),
+            ranked((name, total, calls) for name, (total, calls) in stages.items()),
+            ranked(pairs.items()))
+
+
+def print_summary(events=None, top=DEFAULT_TOP):
+    targets, stages, pairs = summarize(events, top)
+    total = sum(ms for _, ms, _ in stages) or 1.0
+
+    print(f"\n⏱️ Slowest stages (self time, top {top}):")
+    for name, ms, calls in stages:
+        print(f"  {name:12} {ms:9.1f} ms  {ms / total:6.1%}  {calls:5} calls")
+    if targets:
+        print(f"\n⏱️ Slowest targets (wall time, top {top}):")
+        for name, ms in targets:
+            print(f"  {ms:9.1f} ms  {name}")
+    print(f"\n⏱️ Slowest target stages (self time, top {top}):")
+    for (name, stage_name), ms in pairs:
+        print(f"  {ms:9.1f} ms  {stage_name:12} {name}")
+
+
+def add_arguments(parser):
+    """Add --profile [TRACE] and --profile-top N to an argparse parser"""
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_TRACE, metavar="TRACE",
+                        default=os.environ.get(PROFILE_ENV) or None,
+                        help=f"time each stage per output and write a Chrome trace "
+                             f"(default file: {DEFAULT_TRACE}; also ${PROFILE_ENV})")
+    parser.add_argument("--profile-top", type=int, default=DEFAULT_TOP, metavar="N",
+                        help=f"rows in the profile summary (default: {DEFAULT_TOP})")
+
+
+def start(args):
+    """enable() if the parsed `args` asked for --profile"""
+    if getattr(args, "profile", None):
+        enable(args.profile)
+
+
+def finish(args=None):
+    """Write the trace and print the summary, if profiling is on"""
+    if not _enabled:
+        return
+    if _trace_path:
+        write_trace(_trace_path)
+        print(f"\n📈 Trace: {_trace_path} ({len(_events)} spans; open in https://ui.perfetto.dev)")
+    print_summary(top=getattr(args, "profile_top", DEFAULT_TOP))
+
+
+@contextlib.contextmanager
+def session(description, target_name=None):
+    """
+    --profile for scripts without their own argument parser: parse the
+    command line, profile the body under `target_name` (default: the
+    script's file name) and finish() afterwards
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description=description)
+    add_arguments(parser)
+    args = parser.parse_args()
+    start(args)
+    with target(target_name or os.path.basename(sys.argv[0])):
+        yield args
+    finish(args)
@@ -0,0 +1,122 @@
+"""
+Multi-resolution resize pyramid for icon fan-out.
+
+Resizing every target straight from the full-resolution master makes the
+Lanczos filter walk the whole master for each of ~45 outputs. The pyramid
+instead keeps a cascade of cheap 2x box reductions (`Image.reduce`) of the
+master and resamples each target from the smallest level that is still at
+least `reducing_gap` times larger than it - the same trade-off Pillow's own
+`reducing_gap` option makes, but shared across all targets.
+
+With the default gap of 3.0 the results are visually identical to a direct
+Lanczos resize (a few levels of difference on hard edges at most).
+
+Each output size is resampled once per pyramid: the frames are memoized, so
+targets that ask for the same size (the 48 px mdpi launcher icon and the
+48 px .ico entry, the 32 px favicon and .ico entry, ...) get the same
+image back. Frames are shared - treat them as read-only.
+"""
+
+import math
+import threading
+
+from PIL import Image
+
+from pebble_assets import profiling
+from pebble_assets.source_cache import add_eviction_listener, load_source
+
+DEFAULT_REDUCING_GAP = 3.0
+
+
+def _as_size(size):
+    return (size, size) if isinstance(size, int) else tuple(size)
+
+
+class ResizePyramid:
+    """Lazily built 2x reduction levels of one source image"""
+
+    def __init__(self, source, reducing_gap=DEFAULT_REDUCING_GAP):
+        self.reducing_gap = reducing_gap
+        self.levels = [source]
+        self.frames = {}
+        self._lock = threading.Lock()
+
+    def _base_for(self, size):
+        """Smallest level at least `reducing_gap` times the target size"""
+        width, height = size
+        min_width = width * self.reducing_gap
+        min_height = height * self.reducing_gap
+        level = self.levels[0]
+        for candidate in self.levels[1:]:
+            if candidate.width < min_width or candidate.height < min_height:
+                return level
+            level = candidate
+        # Extend the cascade while another 2x reduction still fits
+        while level.width >= 2 * min_width and level.height >= 2 * min_height:
+            with profiling.stage("reduce"):
+                level = level.reduce(2)
+            self.levels.append(level)
+        return level
+
+    @profiling.timed("resample")
+    def resize(self, size):
+        """The source resampled to `size` (int or (width, height)), memoized per size"""
+        size = _as_size(size)
+        with self._lock:
+            frame = self.frames.get(size)
+            if frame is not None:
+                return frame
+            base = self._base_for(size)
+        frame = base.copy() if base.size == size else base.resize(size, Image.Resampling.LANCZOS)
+        with self._lock:
+            return self.frames.setdefault(size, frame)
+
+    def resize_all(self, sizes):
+        """
+        Every requested size in one pass, largest first, so each reduction
+        level is computed once and reused by all smaller sizes. Returns
+        {size: frame} (frames are memoized like resize()).
+        """
+        order = sorted(set(sizes), key=lambda s: _as_size(s)[0] * _as_size(s)[1], reverse=True)
+        return {size: self.resize(size) for size in order}
+
+
+_pyramids = {}
+_pyramids_lock = threading.Lock()
+
+
+def _drop_pyramids(source):
+    """Forget the pyramids built on `source`, which the source cache just evicted"""
+    with _pyramids_lock:
+        for key in [key for key, pyramid in _pyramids.items() if pyramid.levels[0] is source]:
+            del _pyramids[key]
+
+
+add_eviction_listener(_drop_pyramids)
+
+
+def decode_size_for(size, reducing_gap=DEFAULT_REDUCING_GAP):
+    """Smallest source size that still resizes to `size` without a quality loss"""
+    width, height = _as_size(size)
+    return (math.ceil(width * reducing_gap), math.ceil(height * reducing_gap))
+
+
+def source_pyramid(path, reducing_gap=DEFAULT_REDUCING_GAP, max_output=None):
+    """
+    Per-process pyramid of the cached source at `path`.
+
+    Lets independent per-target tasks (e.g. in a process pool worker) share
+    one decode, one set of reduction levels and the resized frames. With
+    `max_output` (the largest size that will be requested) large sources
+    are decoded scaled down to what that size needs; callers whose sizes
+    lead to the same decode share one pyramid.
+    """
+    min_size = decode_size_for(max_output, reducing_gap) if max_output else None
+    source = load_source(path, min_size=min_size)
+    key = (path, reducing_gap, source.size)
+    with _pyramids_lock:
+        pyramid = _pyramids.get(key)
+        if pyramid is None or pyramid.levels[0] is not source:
+            pyramid = ResizePyramid(source, reducing_gap)
+            _pyramids[key] = pyramid
+    return pyramid
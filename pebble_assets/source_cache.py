@@ -0,0 +1,171 @@
+"""
+Decode-once cache for source images.
+
+The resize scripts fan one master image out to dozens of targets. Instead of
+re-opening and re-converting the PNG for every target, each source is decoded
+and mode-converted once per run and the same in-memory image is handed to
+every caller. Entries are keyed by (path, mtime, file size, mode), so an
+edited file is picked up on the next lookup, and the cache is bounded by an
+LRU memory cap.
+
+Cached images are shared - treat them as read-only (resize/crop/copy return
+new images, which is all the generators need). Caches built on top of a
+source image (the resize pyramids) register with `add_eviction_listener` to
+be told when it is dropped, e.g. because `pebble_assets.watch` saw the
+master change.
+
+Callers that only need a small result pass `min_size`, the smallest
+(width, height) the decoded image must still cover. JPEGs are then decoded
+at 1/2, 1/4 or 1/8 scale in the DCT domain (`draft`), and other formats are
+box-reduced by an integer factor right after decoding, so only the small
+copy is kept. Entries are keyed by the reduction that `min_size` leads to,
+not by `min_size` itself, so callers asking for different sizes that need
+the same decode share one image. `estimate_decode_bytes` reads just the header to predict the
+peak memory of such a load, for schedulers that enforce a memory ceiling.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+from pebble_assets import profiling
+
+# Decoded pixel budget for the default cache (a 1024x1024 RGBA master is 4 MB)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def image_nbytes(img):
+    """Approximate in-memory size of a decoded image"""
+    return img.width * img.height * len(img.getbands())
+
+
+def _draft_scale(size, min_size):
+    """JPEG DCT scale (1, 2, 4 or 8) that still covers `min_size`"""
+    scale = 1
+    while scale < 8 and size[0] // (scale * 2) >= min_size[0] and size[1] // (scale * 2) >= min_size[1]:
+        scale *= 2
+    return scale
+
+
+def _reduction(size, format, min_size):
+    """(JPEG draft scale, box-reduce factor) that decode() applies for `min_size`"""
+    if not min_size:
+        return (1, 1)
+    scale = _draft_scale(size, min_size) if format == 'JPEG' else 1
+    width, height = -(-size[0] // scale), -(-size[1] // scale)
+    factor = min(width // min_size[0], height // min_size[1])
+    return (scale, factor if factor >= 2 else 1)
+
+
+@profiling.timed("decode")
+def decode(path, mode='RGBA', min_size=None):
+    """Decode `path` to `mode`, no larger than needed to cover `min_size`"""
+    img = Image.open(path)
+    if min_size and img.format == 'JPEG':
+        img.draft(None, tuple(min_size))
+    img.load()
+    if mode and img.mode != mode:
+        img = img.convert(mode)
+    if min_size:
+        factor = min(img.width // min_size[0], img.height // min_size[1])
+        if factor >= 2:
+            img = img.reduce(factor)
+    return img
+
+
+def estimate_decode_bytes(path, mode='RGBA', min_size=None):
+    """Peak memory of decode(path, mode, min_size), from the file header alone"""
+    with Image.open(path) as img:
+        width, height = img.size
+        decoded_bands = len(img.getbands())
+        if min_size and img.format == 'JPEG':
+            scale = _draft_scale(img.size, min_size)
+            width, height = -(-width // scale), -(-height // scale)
+    target_bands = len(mode) if mode else decoded_bands
+    # The decoded image and its mode-converted copy are alive at once
+    return width * height * (decoded_bands + target_bands)
+
+
+class SourceCache:
+    """LRU cache of decoded, mode-converted source images"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._headers = {}
+        self._lock = threading.RLock()
+
+    def _key(self, path, mode, min_size):
+        stat = os.stat(path)
+        path = os.path.abspath(path)
+        reduction = (1, 1)
+        if min_size:
+            header_key = (path, stat.st_mtime_ns, stat.st_size)
+            header = self._headers.get(header_key)
+            if header is None:
+                with Image.open(path) as img:
+                    header = self._headers[header_key] = (img.size, img.format)
+            reduction = _reduction(*header, min_size)
+        return (path, stat.st_mtime_ns, stat.st_size, mode, reduction)
+
+    def get(self, path, mode='RGBA', min_size=None):
+        """Return the decoded image at `path` converted to `mode` (covering `min_size`)"""
+        key = self._key(path, mode, min_size)
+        # Held across the decode so concurrent builders never decode twice
+        with self._lock:
+            img = self._entries.get(key)
+            if img is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return img
+
+            self.misses += 1
+            img = decode(path, mode, min_size)
+            self._store(key, img)
+            return img
+
+    def _store(self, key, img):
+        nbytes = image_nbytes(img)
+        if nbytes > self.max_bytes:
+            # Larger than the whole budget: hand it out without caching
+            return
+        # Drop every cached version of an older (mtime, size) of the same file
+        for old_key in [k for k in self._entries if k[0] == key[0] and k[1:3] != key[1:3]]:
+            self._evict(old_key)
+        for header_key in [k for k in self._headers if k[0] == key[0] and k[1:] != key[1:3]]:
+            del self._headers[header_key]
+        self._entries[key] = img
+        self.total_bytes += nbytes
+        while self.total_bytes > self.max_bytes:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key):
+        img = self._entries.pop(key)
+        self.total_bytes -= image_nbytes(img)
+        for listener in _eviction_listeners:
+            listener(img)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._evict(key)
+            self._headers.clear()
+
+
+_default_cache = SourceCache()
+_eviction_listeners = []
+
+
+def add_eviction_listener(listener):
+    """Call `listener(image)` whenever a cache drops a decoded source image"""
+    _eviction_listeners.append(listener)
+
+
+def load_source(path, mode='RGBA', min_size=None):
+    """Decode `path` once per run (per mode and min_size) through the shared cache"""
+    return _default_cache.get(path, mode, min_size)
@@ -0,0 +1,121 @@
+"""
+Resolution-independent shape lists for procedurally drawn artwork.
+
+A design is described once as a list of shapes in pixel coordinates of a
+size x size canvas:
+
+    RoundedRect(box, radius, fill)    box = (x0, y0, x1, y1)
+    Line(points, width, fill)         straight stroke with butt ends
+                                      (width may be fractional; ImageDraw
+                                      strokes whole pixels, so rasterize
+                                      truncates it like int())
+    Ellipse(box, fill)
+    Polygon(points, fill)
+
+and can then be rasterized with ImageDraw (exactly the calls the
+generators used to make by hand) or exported as SVG or as an Android
+VectorDrawable, so the same geometry yields every format.
+"""
+
+from collections import namedtuple
+
+RoundedRect = namedtuple("RoundedRect", "box radius fill")
+Line = namedtuple("Line", "points width fill")
+Ellipse = namedtuple("Ellipse", "box fill")
+Polygon = namedtuple("Polygon", "points fill")
+
+
+def rasterize(draw, shapes):
+    """Draw `shapes` with a PIL ImageDraw"""
+    for shape in shapes:
+        if isinstance(shape, RoundedRect):
+            draw.rounded_rectangle(list(shape.box), radius=shape.radius, fill=shape.fill)
+        elif isinstance(shape, Line):
+            draw.line(list(shape.points), fill=shape.fill, width=int(shape.width))
+        elif isinstance(shape, Ellipse):
+            draw.ellipse(list(shape.box), fill=shape.fill)
+        elif isinstance(shape, Polygon):
+            draw.polygon(list(shape.points), fill=shape.fill)
+        else:
+            raise TypeError(f"Unknown shape: {shape!r}")
+
+
+def _num(value):
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _hex(color):
+    return "#" + "".join(f"{channel:02X}" for channel in color[:3])
+
+
+def path_data(shape):
+    """SVG / VectorDrawable path data for one shape"""
+    if isinstance(shape, RoundedRect):
+        x0, y0, x1, y1 = shape.box
+        r = min(shape.radius, (x1 - x0) / 2, (y1 - y0) / 2)
+        arc = f"A{_num(r)} {_num(r)} 0 0 1"
+        return (f"M{_num(x0 + r)} {_num(y0)}H{_num(x1 - r)}{arc} {_num(x1)} {_num(y0 + r)}"
+                f"V{_num(y1 - r)}{arc} {_num(x1 - r)} {_num(y1)}H{_num(x0 + r)}"
+                f"{arc} {_num(x0)} {_num(y1 - r)}V{_num(y0 + r)}{arc} {_num(x0 + r)} {_num(y0)}Z")
+    if isinstance(shape, Ellipse):
+        x0, y0, x1, y1 = shape.box
+        rx, ry, cy = (x1 - x0) / 2, (y1 - y0) / 2, (y0 + y1) / 2
+        arc = f"A{_num(rx)} {_num(ry)} 0 1 0"
+        return f"M{_num(x0)} {_num(cy)}{arc} {_num(x1)} {_num(cy)}{arc} {_num(x0)} {_num(cy)}Z"
+    if isinstance(shape, (Line, Polygon)):
+        first, *rest = shape.points
+        data = f"M{_num(first[0])} {_num(first[1])}" + "".join(
+            f"L{_num(x)} {_num(y)}" for x, y in rest)
+        return data + ("Z" if isinstance(shape, Polygon) else "")
+    raise TypeError(f"Unknown shape: {shape!r}")
+
+
+def svg(shapes, size):
+    """SVG document for `shapes` drawn on a size x size canvas"""
+    lines = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{_num(size)}" height="{_num(size)}" '
+             f'viewBox="0 0 {_num(size)} {_num(size)}">']
+    for shape in shapes:
+        if isinstance(shape, Line):
+            lines.append(f'  <path d="{path_data(shape)}" fill="none" stroke="{_hex(shape.fill)}" '
+                         f'stroke-width="{_num(shape.width)}"/>')
+        else:
+            lines.append(f'  <path d="{path_data(shape)}" fill="{_hex(shape.fill)}"/>')
+    lines.append("</svg>")
+    return "\n".join(lines) + "\n"
+
+
+def vector_drawable(shapes, size, dp=108, scale=1.0):
+    """
+    Android VectorDrawable XML for `shapes` on a size x size viewport shown
+    at `dp`, scaled by `scale` about the center (e.g. 66/108 to fit an
+    adaptive icon's safe zone).
+    """
+    ns = 'xmlns:android="http://schemas.android.com/apk/res/android"'
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        f'<vector {ns}',
+        f'    android:width="{_num(dp)}dp"',
+        f'    android:height="{_num(dp)}dp"',
+        f'    android:viewportWidth="{_num(size)}"',
+        f'    android:viewportHeight="{_num(size)}">',
+        f'  <group android:pivotX="{_num(size / 2)}" android:pivotY="{_num(size / 2)}"',
+        f'      android:scaleX="{_num(scale)}" android:scaleY="{_num(scale)}">',
+    ]
+    for shape in shapes:
+        if isinstance(shape, Line):
+            lines += [
+                "    <path",
+                f'        android:strokeColor="{_hex(shape.fill)}"',
+                f'        android:strokeWidth="{_num(shape.width)}"',
+                '        android:strokeLineCap="butt"',
+                f'        android:pathData="{path_data(shape)}"/>',
+            ]
+        else:
+            lines += [
+                "    <path",
+                f'        android:fillColor="{_hex(shape.fill)}"',
+                f'        android:pathData="{path_data(shape)}"/>',
+            ]
+    lines += ["  </group>", "</vector>"]
+    return "\n".join(lines) + "\n"
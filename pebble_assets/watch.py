@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Watch mode: rebuild generated assets as their sources change.
+
+One long-lived process builds everything once, then polls the source images
+named in asset_spec.json and the spec itself. When a file changes (and has
+stayed unchanged for the debounce interval, so an editor's save-in-several-
+writes is one event) only the targets that read it, and the targets built
+from those, are rebuilt.
+
+Everything expensive stays resident between rebuilds: decoded sources and
+their resize pyramids (the source cache re-decodes a file only when its
+mtime or size changes), opened fonts, imported builder modules and the
+manifest's source hashes. Editing the spec rebuilds just the targets whose
+definition changed. Changes to generator code need a restart.
+
+Usage (from the repo root):
+    python -m pebble_assets.watch                      # every target
+    python -m pebble_assets.watch android-icons ios-icons
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from pebble_assets import writer
+from pebble_assets.build import SPEC_PATH, load_spec, plan, run
+from pebble_assets.encoder import (ANDROID_FORMAT_ENV, ANDROID_FORMATS, DEFAULT_PROFILE, PROFILE_ENV,
+                                   PROFILES, set_android_format, set_palette, set_profile)
+from pebble_assets.manifest import AssetManifest
+
+DEFAULT_INTERVAL = 0.2
+DEFAULT_DEBOUNCE = 0.3
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def source_dependents(targets):
+    """{source path: [target names that read it]} for inputs no target produces"""
+    produced = {os.path.normpath(path) for target in targets.values() for path in target["outputs"]}
+    readers = {}
+    for name, target in targets.items():
+        for path in target.get("inputs", []):
+            if os.path.normpath(path) not in produced:
+                readers.setdefault(os.path.normpath(path), []).append(name)
+    return readers
+
+
+def affected_targets(targets, changed):
+    """Targets in `changed` plus every target downstream of them, in build order"""
+    affected = set(changed)
+    grew = True
+    while grew:
+        grew = False
+        for name, target in targets.items():
+            if name not in affected and affected & set(target["deps"]):
+                affected.add(name)
+                grew = True
+    return [name for name in plan(targets) if name in affected]
+
+
+class Watcher:
+    """Polls sources and the spec, rebuilding only the targets a change affects"""
+
+    def __init__(self, spec_path=SPEC_PATH, requested=None, jobs=None,
+                 interval=DEFAULT_INTERVAL, debounce=DEFAULT_DEBOUNCE):
+        self.spec_path = spec_path
+        self.requested = requested
+        self.jobs = jobs
+        self.interval = interval
+        self.debounce = debounce
+        # Kept for the whole session so source hashes are memoized across rebuilds
+        self.manifest = AssetManifest()
+        self._load()
+
+    def _load(self):
+        targets = load_spec(self.spec_path)
+        self.scope = set(plan(targets, self.requested))
+        self.targets = {name: target for name, target in targets.items() if name in self.scope}
+        self.readers = source_dependents(self.targets)
+        self.stamps = {path: _stamp(path) for path in [self.spec_path, *self.readers]}
+
+    def build(self, names, reason):
+        if not names:
+            return
+        start = time.perf_counter()
+        print(f"\n🔁 {reason} -> {', '.join(names)}")
+        try:
+            run(self.targets, names, self.manifest, self.jobs)
+        except Exception as e:  # a half-written or invalid source must not end the session
+            print(f"❌ {type(e).__name__}: {e} (will retry on the next change)")
+            return
+        finally:
+            self.manifest.save()
+            writer.print_summary()
+        print(f"✅ Rebuilt {len(names)} target(s) in {time.perf_counter() - start:.2f} s")
+
+    def _reload_spec(self):
+        """Reload the spec, returning the targets whose definition changed"""
+        old = self.targets
+        try:
+            self._load()
+        except (OSError, ValueError) as e:
+            print(f"❌ {self.spec_path}: {e} (keeping the previous spec)")
+            return []
+        return [name for name, target in self.targets.items() if old.get(name) != target]
+
+    def poll(self):
+        """Paths whose stamp changed since the last poll"""
+        changed = []
+        for path, stamp in self.stamps.items():
+            current = _stamp(path)
+            if current != stamp:
+                self.stamps[path] = current
+                changed.append(path)
+        return changed
+
+    def rebuild(self, paths):
+        """Rebuild whatever depends on the changed `paths`"""
+        changed_targets = set()
+        if self.spec_path in paths:
+            changed_targets |= set(self._reload_spec())
+        for path in paths:
+            if path in self.readers and _stamp(path) is not None:
+                changed_targets |= {name for name in self.readers[path] if name in self.targets}
+        missing = [path for path in paths if path != self.spec_path and _stamp(path) is None]
+        for path in missing:
+            print(f"⚠️ {path} disappeared, waiting for it to come back")
+        self.build(affected_targets(self.targets, changed_targets),
+                   f"{', '.join(paths)} changed")
+
+    def watch(self):
+        self.build(plan(self.targets), "initial build")
+        print(f"\n👀 Watching {len(self.stamps)} files (Ctrl-C to stop)")
+        pending = set()
+        last_change = 0.0
+        try:
+            while True:
+                time.sleep(self.interval)
+                changed = self.poll()
+                if changed:
+                    pending.update(changed)
+                    last_change = time.monotonic()
+                elif pending and time.monotonic() - last_change >= self.debounce:
+                    paths = sorted(pending)
+                    pending.clear()
+                    self.rebuild(paths)
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")
+        return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild generated assets whenever their sources change")
+    parser.add_argument("targets", nargs="*", help="targets to keep up to date (default: all)")
+    parser.add_argument("--spec", default=SPEC_PATH, help=f"spec file (default: {SPEC_PATH})")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="concurrent targets (default: all cores)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help=f"seconds between polls (default: {DEFAULT_INTERVAL})")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help=f"quiet seconds after a change before rebuilding "
+                             f"(default: {DEFAULT_DEBOUNCE})")
+    parser.add_argument("--png-profile", choices=sorted(PROFILES),
+                        help=f"PNG encoder profile (default: ${PROFILE_ENV} or {DEFAULT_PROFILE})")
+    parser.add_argument("--android-format", choices=ANDROID_FORMATS,
+                        help=f"format of Android drawable/mipmap outputs "
+                             f"(default: ${ANDROID_FORMAT_ENV} or png)")
+    parser.add_argument("--png-palette", action="store_true",
+                        help="store low-colour PNGs as 8-bit palette images")
+    args = parser.parse_args(argv)
+    if args.png_profile:
+        set_profile(args.png_profile)
+    if args.android_format:
+        set_android_format(args.android_format)
+    if args.png_palette:
+        set_palette(True)
+
+    try:
+        watcher = Watcher(args.spec, args.targets or None, args.jobs or None,
+                          args.interval, args.debounce)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    return watcher.watch()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Atomic, write-if-changed output files.
+
+Every generated asset is encoded in memory first and handed to
+`write_bytes`, which compares it with the file already on disk and leaves
+that file alone - mtime included - when the bytes are identical. Gradle's
+resource merger, Xcode's asset compiler and Flutter's asset bundler all key
+on mtimes, so an unchanged icon no longer makes them redo work.
+
+Changed files are written to a hidden temporary file in the same folder and
+renamed over the destination, so a crash mid-write leaves either the old
+file or the new one, never a truncated PNG. (The dot prefix keeps an
+orphaned temp file out of Android resource merging and the app bundle.)
+
+Each write is counted; `print_summary()` reports how many outputs changed
+in this run.
+"""
+
+import hashlib
+import os
+import threading
+
+from pebble_assets import profiling
+
+_results = []
+_lock = threading.Lock()
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.digest()
+
+
+def unchanged(path, data):
+    """True when `path` already holds exactly `data`"""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        return _file_digest(path) == hashlib.sha256(data).digest()
+    except OSError:
+        return False
+
+
+def write_bytes(path, data):
+    """Atomically write `data` to `path` unless it already holds it; True if written"""
+    with profiling.stage("write"):
+        changed = not unchanged(path, data)
+        if changed:
+            folder, name = os.path.split(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            tmp_path = os.path.join(folder, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+    with _lock:
+        _results.append((path, changed))
+    return changed
+
+
+def write_text(path, text):
+    """write_bytes() for UTF-8 text with Unix line endings"""
+    return write_bytes(path, text.encode('utf-8'))
+
+
+def drain():
+    """Remove and return the recorded (path, changed) results (to ship them out of workers)"""
+    with _lock:
+        results = _results[:]
+        del _results[:]
+    return results
+
+
+def merge(results):
+    """Add results recorded elsewhere (e.g. returned from a worker process)"""
+    with _lock:
+        _results.extend(results)
+
+
+def print_summary():
+    """Print how many outputs were rewritten vs. left untouched, and reset the counts"""
+    results = drain()
+    if not results:
+        return
+    written = sum(1 for _, changed in results if changed)
+    print(f"\n💾 Outputs: {written} written, {len(results) - written} unchanged")
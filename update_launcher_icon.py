@@ -1,48 +1,31 @@
 """
 Update ic_launcher.png in all mipmap folders from source image.
+
+The densities are the optional `android-icons-from-foreground` target in
+asset_spec.json (icon_foreground.png resized into the files `android-icons`
+normally renders from icon.png); this script builds that target. `--fix`
+chains pebble_assets.pipeline presets after the resize, on the in-memory
+image, so each icon is still written only once:
+    python update_launcher_icon.py --fix transparent whitespace
 """
 
-from PIL import Image
-import os
+import argparse
+import sys
+
+from pebble_assets import build
+from pebble_assets.pipeline import PRESETS
+
+TARGET = 'android-icons-from-foreground'
 
-# Standard launcher icon sizes for each density
-DENSITIES = [
-    ('mipmap-mdpi', 48),
-    ('mipmap-hdpi', 72),
-    ('mipmap-xhdpi', 96),
-    ('mipmap-xxhdpi', 144),
-    ('mipmap-xxxhdpi', 192),
-]
 
-def update_launcher_icons(source_path: str, res_path: str):
-    """Update ic_launcher.png in all mipmap folders."""
-    
-    source = Image.open(source_path)
-    print(f"✅ Loaded source: {source.size[0]}x{source.size[1]}")
-    
-    # Convert to RGBA
-    if source.mode != 'RGBA':
-        source = source.convert('RGBA')
-    
-    for folder, size in DENSITIES:
-        # Resize with high quality
-        resized = source.resize((size, size), Image.Resampling.LANCZOS)
-        
-        output_folder = os.path.join(res_path, folder)
-        output_path = os.path.join(output_folder, 'ic_launcher.png')
-        
-        if os.path.exists(output_folder):
-            resized.save(output_path, 'PNG', optimize=True)
-            print(f"✅ Updated {folder}/ic_launcher.png ({size}x{size})")
-        else:
-            print(f"⚠️ Folder not found: {folder}")
+def main(argv=None):
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--fix', nargs='+', default=[], choices=sorted(PRESETS), metavar='PRESET',
+                        help=f"pipeline presets to apply after resizing, in order ({', '.join(sorted(PRESETS))})")
+    args, rest = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    # Build flags (--force, --png-profile, --profile, ...) pass straight through
+    params = {TARGET: {'fix': args.fix}} if args.fix else None
+    return build.main([TARGET] + rest, params=params)
 
 if __name__ == '__main__':
-    source = 'assets/icon/icon_foreground.png'
-    res_path = 'android/app/src/main/res'
-    
-    if not os.path.exists(source):
-        print(f"❌ Source not found: {source}")
-    else:
-        update_launcher_icons(source, res_path)
-        print("\n✅ All launcher icons updated!")
+    sys.exit(main())